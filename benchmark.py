@@ -0,0 +1,49 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import sys
+from os import listdir
+from os.path import join
+
+from src.models.amazons import read_file
+from src.models.board import Board
+from src.models.players import AIPlayer, Timer
+from src.const import BOARDS_DIR, INF, PLAYER_1, SEARCHES
+
+
+def nodes_to_depth(board_path, search, depth):
+    """
+    Compte le nombre de noeuds visités par l'IA pour atteindre une certaine profondeur
+
+    Args:
+        board_path (str): chemin vers un fichier de plateau
+        search (str): l'algorithme de recherche (parmi SEARCHES)
+        depth (int): la profondeur à atteindre
+
+    Returns:
+        tuple: (nodes, depth_reached, time) le nombre de noeuds, la profondeur atteinte et le temps en secondes
+    """
+    board = Board(*read_file(board_path))
+    player = AIPlayer(board, PLAYER_1, search=search)
+    player.timer = Timer(INF)  # pas de limite de temps: on s'arrête à la profondeur donnée
+    player.iterative_deepening(max_depth=depth)
+    depth_reached = player.iterations_stats[-1][0]
+    return player.nodes_count, depth_reached, player.timer.time
+
+
+def main(depth=2):
+    """Compare les algorithmes de recherche sur tous les plateaux de BOARDS_DIR"""
+    print(f"{'plateau':<22}" + ''.join(f"{search:>24}" for search in SEARCHES))
+    for filename in sorted(listdir(BOARDS_DIR)):
+        row = f"{filename:<22}"
+        for search in SEARCHES:
+            nodes, depth_reached, time = nodes_to_depth(join(BOARDS_DIR, filename), search, depth)
+            row += f"{nodes:>10} (d={depth_reached}) {time:>7.2f}s"
+        print(row)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
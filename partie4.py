@@ -4,10 +4,21 @@ Nom:        ROMANOVA
 Matricule:  521935
 """
 
-from src.controllers.app_controller import AppController
+import sys
 
-def main():
-    AppController()
+
+def main(argv=None):
+    """
+    Lance l'interface graphique si aucun argument n'est donné, sinon une partie en ligne de commande (c.f. src.cli)
+    PyQt5 et pygame ne sont importés que pour l'interface graphique.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        from src.cli import main as cli_main
+        cli_main(argv)
+    else:
+        from src.controllers.app_controller import AppController
+        AppController()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,77 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+from argparse import ArgumentParser
+from os.path import join
+from src.const import BOARDS_DIR, PLAYERS
+from src.models.amazons import Amazons
+from src.models.players import HumanPlayer, AIPlayer, MCTSPlayer, fast_board_class
+from src.models.warmup import warm_up
+
+# types de joueurs disponibles en ligne de commande
+PLAYER_TYPES = {
+    'human': HumanPlayer,
+    'ai': AIPlayer,
+    'mcts': MCTSPlayer,
+}
+
+
+def build_parser():
+    """ArgumentParser: renvoie le parseur des arguments de la ligne de commande"""
+    parser = ArgumentParser(description="Jeu des Amazones en ligne de commande (sans interface graphique)")
+    parser.add_argument('board', nargs='?', default=join(BOARDS_DIR, 'plateau_default.txt'),
+                        help="chemin vers un fichier de plateau")
+    parser.add_argument('-1', '--player1', choices=PLAYER_TYPES, default='human', help="type du joueur 1")
+    parser.add_argument('-2', '--player2', choices=PLAYER_TYPES, default='ai', help="type du joueur 2")
+    parser.add_argument('-t', '--timeout', type=float, default=2,
+                        help="temps (en secondes) dont disposent les joueurs artificiels pour chaque action")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="n'affiche pas le plateau, seulement le résultat de la partie")
+    return parser
+
+
+def create_player(player_type, board, player_id, timeout):
+    """Player: crée un joueur du type donné (parmi PLAYER_TYPES)"""
+    player_class = PLAYER_TYPES[player_type]
+    if player_class is HumanPlayer:
+        return HumanPlayer(board, player_id)
+    return player_class(board, player_id, timeout=timeout)
+
+
+def play(board_path, player_types, timeout=2, quiet=False):
+    """
+    Joue une partie en mode texte
+
+    Args:
+        board_path (str): chemin vers un fichier de plateau
+        player_types (tuple): le type (parmi PLAYER_TYPES) de chaque joueur
+        timeout (float): temps (en secondes) des joueurs artificiels pour chaque action
+        quiet (bool): si True, seul le résultat de la partie est affiché
+
+    Returns:
+        Amazons: la partie terminée
+    """
+    if any(PLAYER_TYPES[player_type] is not HumanPlayer for player_type in player_types):
+        warm_up.start()
+    game = Amazons(board_path, show_text_board=not quiet)
+    game.players = tuple(create_player(player_type, game.board, player_id, timeout)
+                         for player_type, player_id in zip(player_types, PLAYERS))
+    if not quiet and any(PLAYER_TYPES[player_type] is not HumanPlayer for player_type in player_types):
+        print(f"Moteur de l'IA: {fast_board_class().engine_description()}")
+    game.play()
+    if quiet:
+        game.show_winner()
+    return game
+
+
+def main(argv=None):
+    """Point d'entrée de la ligne de commande, argv: les arguments (None: sys.argv)"""
+    args = build_parser().parse_args(argv)
+    play(args.board, (args.player1, args.player2), args.timeout, args.quiet)
+
+
+if __name__ == '__main__':
+    main()
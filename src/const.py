@@ -23,8 +23,36 @@ WIN = 100000
 DRAW = 0
 # LOSS = -WIN
 
+# algorithmes de recherche de AIPlayer
+SEARCH_MTDF = 'mtdf'
+SEARCH_PVS = 'pvs'
+SEARCHES = (SEARCH_MTDF, SEARCH_PVS)
+ASPIRATION_WINDOW_DEFAULT = 100  # demi-largeur de la fenêtre d'aspiration de PVS
+LMR_REDUCTION_DEFAULT = 1  # réduction de profondeur des enfants tardifs (si les late move reductions sont activées)
+
+# MCTSPlayer
+MCTS_EXPLORATION_DEFAULT = 1.4  # constante d'exploration de UCT (~sqrt(2))
+MCTS_PLAYOUTS_DEFAULT = 16  # nombre de parties aléatoires jouées à chaque feuille
+MCTS_MAX_PLIES_DEFAULT = 20  # nombre d'actions d'une partie aléatoire avant d'évaluer le territoire (0: jusqu'à la fin)
+
+# Board
+BOARD_MAX_SIZE = 26  # une colonne par lettre (c.f. Pos2D.from_string)
+BOARD_FILE_MAX_LINE_LENGTH = 4 * BOARD_MAX_SIZE ** 2  # une position par case, séparées par des virgules
+BOARD_FILE_CACHE_SIZE = 64  # nombre de versions de fichiers de plateau gardées en cache (c.f. load_board_file)
+SNAPSHOT_INTERVAL_DEFAULT = 16  # nombre d'actions entre deux instantanés du plateau (c.f. Board.seek)
+
+# FastBoard
+EVALUATION_COEFS_DEFAULT = (2, 8, 8, 2)  # (mobilité, territoire, portée, territoire relatif) c.f. heuristics_linear_comb
+EVALUATION_CHUNK_SIZE_DEFAULT = 65536  # nombre de plateaux évalués à la fois par batch_evaluation.iter_chunks
+ENGINE_ENV_VAR = 'AMAZONS_ENGINE'  # variable d'environnement qui permet de forcer le moteur des joueurs artificiels
+ENGINE_PYTHON = 'python'  # valeur de ENGINE_ENV_VAR qui force BitBoard (Python pur)
+ENGINE_CLOSE_TIMEOUT = 1  # secondes laissées au processus d'un moteur pour s'arrêter avant qu'il ne soit tué
+WARM_UP_BOARD = (4, ['a4', 'd1'], ['a1', 'd4'], ['b2'])  # (taille, noirs, blancs, flèches) du plateau de préchauffage
+ZOBRIST_SEED = 521935  # graine des nombres aléatoires des clés de Zobrist (identiques d'une partie à l'autre)
+
 AI_AI_DELAY_MINMAX_MILLIS = (2000, 10000)
 AI_AI_DELAY_DEFAULT_MILLIS = 2000
+GUI_PLAYER_WAIT_TIMEOUT = 0.5  # secondes entre deux vérifications de l'arrêt d'un joueur de l'interface en attente
 
 NORTH =      (1, 0)
 NORTH_EAST = (1, 1)
@@ -55,6 +83,9 @@ MESSAGE_COUP = "Joueur {}, donnez un coup de format 'position reine avant > posi
 # BOARD
 DEFAULT_TILE_COLORS = ["af3232", "ffd7c8"]
 MIN_TILE_SIZE = 25
+RESIZE_DEBOUNCE_MILLIS = 150  # délai sans redimensionnement avant de redimensionner les images avec antialiasing
+PAINTED_BOARD_MIN_SIZE = 12  # taille à partir de laquelle les flèches et marqueurs sont dessinés par un seul élément
+PIXMAP_CACHE_MAX_SIZE = 32  # nombre maximal d'images redimensionnées gardées en cache par BoardScene
 
 # ASSETS
 
@@ -13,7 +13,7 @@ from src.views.game_widget import GameWidget, GameWidgetDelegate
 from src.controllers.point_pos_bridge import to_ui_coord, action_to_game_coords
 from src.controllers.main_thread_executor import MainThreadExecutor
 from src.const import QUEEN_ICONS
-from copy import deepcopy
+from src.views import const_strings
 
 
 class GameViewController(BoardSceneDelegate, GuiPlayerDelegate, AmazonsDelegate, GameWidgetDelegate):
@@ -22,7 +22,6 @@ class GameViewController(BoardSceneDelegate, GuiPlayerDelegate, AmazonsDelegate,
     """
     def __init__(self, game: Amazons):
         self.game = game
-        self.original_game = deepcopy(self.game)  # to make it possible for the user to restart the game later on
 
         self.window = None
         self.board_view = None
@@ -87,17 +86,25 @@ class GameViewController(BoardSceneDelegate, GuiPlayerDelegate, AmazonsDelegate,
                 coords = action_to_game_coords(self.game.board.size, action)
                 MainThreadExecutor.shared.run(bd_scene.perform_action, *coords)
 
+    def engine_failed(self, player_id, details=None):
+        """méthode de GuiPlayerDelegate qui est appelée par AIGuiPlayer lorsque son moteur s'est arrêté"""
+        self.stop_game()
+        if not self.window.will_unload:
+            MainThreadExecutor.shared.run(self.board_view.board_scene.stop_all_possible_interaction)
+            MainThreadExecutor.shared.run(self.window.exhibit_error, const_strings.ENGINE_FAILED_MESS, details)
+
     # AmazonsDelegate protocol
 
     def player_changed(self, new_player_id):
         """méthode de AmazonsDelegate qui est appelée par Amazons lorsque le tour du joueur précédent est terminé"""
         if not self.window.will_unload:
-            self.window.update_current_turn_indicator(QUEEN_ICONS[new_player_id])
+            MainThreadExecutor.shared.run_coalesced('turn_indicator', self.window.update_current_turn_indicator,
+                                                    QUEEN_ICONS[new_player_id])
             new_player = self.game.players[new_player_id]
             self.board_view.board_scene.board_delegate = new_player
 
         if len(self.game.board.history) > 0:
-            MainThreadExecutor.shared.run(self.window.restart_game_btn.setDisabled, False)
+            MainThreadExecutor.shared.run_coalesced('restart_btn', self.window.restart_game_btn.setDisabled, False)
 
     def game_ended(self, winner):
         """méthode de AmazonsDelegate qui est appelée par Amazons lorsque le jeu est fini"""
@@ -110,31 +117,37 @@ class GameViewController(BoardSceneDelegate, GuiPlayerDelegate, AmazonsDelegate,
         """
         méthode de GameWidgetDelegate qui est appelée par GameWidget lorsque celui-ci est sur le
         point d'être fermé
-        La liste de tâche à exécuter sur le main thread est alors vidée
+        La partie (et les moteurs des IA) est alors arrêtée et la liste de tâche à exécuter sur le main thread est
+        vidée
         """
-        MainThreadExecutor.shared.main_thread_functions = []
+        self.stop_game()
+        MainThreadExecutor.shared.clear()
+
+    def stop_game(self):
+        """Arrête le thread de la partie en cours et ses joueurs (les processus des moteurs des IA sont fermés)"""
+        self.game.should_stop_execution = True
+        for player in self.game.players:
+            player.should_stop_execution = True
+            try:
+                player.delegate = None
+            except Exception:
+                pass
 
     def restart_game(self):
         """
         méthode de GameWidgetDelegate qui est appelée par GameWidget lorsque le jeu doit être recommencé
-        la sauvegarde de game est alors remise dans self.game et le jeu reprend depuis le début
+        une nouvelle partie est alors créée depuis la position de départ de self.game (c.f. Amazons.new_game)
         """
         if not self.window.will_unload:
-            # Stop thread execution
-            self.game.should_stop_execution = True
-            for player in self.game.players:
-                player.should_stop_execution = True
-                try:
-                    player.delegate = None
-                except Exception:
-                    pass
-
-            # copy the original game state
-            self.game = deepcopy(self.original_game)
+            self.stop_game()
+
+            # le plateau est reconstruit depuis son instantané de départ, sans copier la partie en cours
+            self.game = self.game.new_game()
 
             self.init_board_view()
             self.window.replace_board_view(self.board_view)
             self.init_game()
 
-            # désactiver le bouton "Recommencer" avant que le premier tour ait été joué
-            self.window.restart_game_btn.setDisabled(True)
+            # désactiver le bouton "Recommencer" avant que le premier tour ait été joué (remplace une éventuelle
+            # réactivation de l'ancienne partie encore en attente)
+            MainThreadExecutor.shared.run_coalesced('restart_btn', self.window.restart_game_btn.setDisabled, True)
@@ -4,17 +4,28 @@ Nom:        ROMANOVA
 Matricule:  521935
 """
 
+import threading
+from collections import deque
 from PyQt5.QtCore import QObject, pyqtSignal
 
 
 class MainThreadExecutor(QObject):
-    """Permet d'exécuter des fonctions dans le thread principal à l'aide des signals de Qt"""
+    """
+    Permet d'exécuter des fonctions dans le thread principal à l'aide des signals de Qt
+
+    Les fonctions sont mises dans une file (thread-safe) et un seul signal est en attente à la fois: toutes les
+    fonctions ajoutées avant son traitement sont exécutées ensemble. Les mises à jour identifiées par une clé
+    (c.f. run_coalesced) ne sont exécutées qu'une fois par traitement, avec les arguments du dernier appel.
+    """
     shared = None
     _signal = pyqtSignal()
 
     def __init__(self):
         super(MainThreadExecutor, self).__init__()
-        self.main_thread_functions = []
+        self._lock = threading.Lock()
+        self._tasks = deque()  # (key, f, args, kwargs), key vaut None pour les tâches non fusionnées
+        self._latest = {}  # clé -> (f, args, kwargs) du dernier appel de run_coalesced avec cette clé
+        self._signal_pending = False
         self._signal.connect(self._run)
 
     @classmethod
@@ -23,15 +34,46 @@ class MainThreadExecutor(QObject):
         if cls.shared is None:
             cls.shared = MainThreadExecutor()
 
+    def _push(self, key, f, args, kwargs):
+        with self._lock:
+            if key is None:
+                self._tasks.append((None, f, args, kwargs))
+            else:
+                if key not in self._latest:  # la mise à jour garde la place de son premier appel dans la file
+                    self._tasks.append((key, None, None, None))
+                self._latest[key] = (f, args, kwargs)
+            emit = not self._signal_pending
+            self._signal_pending = True
+        if emit:
+            self._signal.emit()
+
     def run(self, f, *args, **kwargs):
         """Exécute la fonction f avec les tous les arguments donnés"""
-        self.main_thread_functions.append((f, args, kwargs))
-        self._signal.emit()
+        self._push(None, f, args, kwargs)
+
+    def run_coalesced(self, key, f, *args, **kwargs):
+        """
+        Exécute la fonction f avec les arguments donnés, sauf si un appel avec la même clé (ex: la mise à jour d'un
+        même élément de l'interface) la remplace avant son exécution
+        """
+        self._push(key, f, args, kwargs)
+
+    def clear(self):
+        """Retire toutes les fonctions qui n'ont pas encore été exécutées"""
+        with self._lock:
+            self._tasks.clear()
+            self._latest.clear()
 
     def _run(self):
-        # exécute les fonctions qui sont dans la file déjà dans le main thread
-        while self.main_thread_functions:
-            func, args, kwargs = self.main_thread_functions.pop(0)
+        # exécute, dans le main thread, les fonctions ajoutées avant la réception du signal
+        with self._lock:
+            tasks, self._tasks = self._tasks, deque()
+            latest, self._latest = self._latest, {}
+            self._signal_pending = False
+        while tasks:
+            key, func, args, kwargs = tasks.popleft()
+            if key is not None:
+                func, args, kwargs = latest[key]
             try:
                 func(*args, **kwargs)
             except RuntimeError:
@@ -5,6 +5,7 @@ Matricule:  521935
 """
 
 from src.models.amazons import Amazons
+from src.models.board_file import is_board_file_valid
 from src.views.new_game_settings import NewGameSettings, NewGameSettingsDelegate
 from src.const import PLAYERS, AI_AI_DELAY_DEFAULT_MILLIS
 from src.controllers.player_ui import HumanGuiPlayer, AIGuiPlayer
@@ -26,13 +27,9 @@ class NewGameSettingsViewController(NewGameSettingsDelegate):
         """
         Renvoie si le fichier donnée est un fichier valide
 
-        la vérification se fait en initialisant le jeu. Si une erreur a lieu, le fichier est pas bien défini
+        le fichier est seulement lu et validé (sans créer de jeu), le résultat est gardé en cache pour save_settings
         """
-        try:
-            Amazons(file_path, self.ai_ai_delay)
-            return True
-        except:
-            return False
+        return is_board_file_valid(file_path)
 
     def save_settings(self, file_path, players_str, ai_ai_delay) -> bool:
         """
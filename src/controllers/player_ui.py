@@ -6,24 +6,54 @@ Matricule:  521935
 
 from src.controllers.point_pos_bridge import to_game_coord, to_ui_coord
 from src.models.action import Action
-from src.models.players import Player, AIPlayer
+from src.models.players import Player
+from src.models.engine_process import EngineProcess
+from src.models.exceptions import EngineError
+from src.models.legal_moves import LegalMoves
 from src.views.board_scene import BoardSceneDelegate
 from src.controllers.main_thread_executor import MainThreadExecutor
+from src.const import GUI_PLAYER_WAIT_TIMEOUT
+from threading import Event
+import sys
 from time import time
 
 
 class GuiPlayer(Player):
     """
     Classe représentant un joueur de l'interface graphique
+
+    Attributes:
+        action_performed (Event): mis lorsque l'interface a effectué l'action du joueur (ou que le joueur doit
+                                  s'arrêter)
+        stopped (Event): mis lorsque le joueur doit s'arrêter (c.f. should_stop_execution)
     """
     def __init__(self, board, player_id):
+        self.action_performed = Event()
+        self.stopped = Event()
         super(GuiPlayer, self).__init__(board, player_id)
         self.board_scene = None
         self.action = None
         self.delegate = None
         self.can_act = False
 
-        self.should_stop_execution = False
+    @property
+    def should_stop_execution(self):
+        """bool: True si le thread du jeu doit être arrêté, réveille alors le joueur s'il attend"""
+        return self.stopped.is_set()
+
+    @should_stop_execution.setter
+    def should_stop_execution(self, value):
+        if value:
+            self.stopped.set()
+            self.action_performed.set()
+        else:
+            self.stopped.clear()
+
+    def wait_action_performed(self):
+        """Attend, sans occuper le processeur, que l'interface ait effectué l'action ou que le joueur doive s'arrêter"""
+        # le délai ne sert qu'à revérifier l'arrêt si celui-ci a été demandé juste avant action_performed.clear()
+        while not (self.action_performed.wait(GUI_PLAYER_WAIT_TIMEOUT) or self.should_stop_execution):
+            pass
 
     def play(self):
         """Si l'exécution du thread doit être arrêté, aucune action ne sera jouée"""
@@ -35,21 +65,28 @@ class GuiPlayer(Player):
 class HumanGuiPlayer(GuiPlayer, BoardSceneDelegate):
     """
     Classe représentant un joueur humain jouant avec une interface graphique
+
+    Attributes:
+        legal_moves (LegalMoves): les actions légales du joueur, calculées au début de son tour (None sinon)
     """
     def __init__(self, board, player_id):
         super(HumanGuiPlayer, self).__init__(board, player_id)
         self.action = None
+        self.legal_moves = None
 
     def _play(self):
         """Attend que le joueur humain ait joué son coup"""
-        self.can_act = True
         self.action = None
+        self.action_performed.clear()
+        # les questions de l'interface (thread principal) ne consultent plus que legal_moves, jamais le plateau
+        self.legal_moves = LegalMoves.of_board(self.board, self.player_id)
+        self.can_act = True
         self.board_scene.allow_pieces_interaction(self.player_id)
 
-        # wait until the user moves his pieces
-        while self.action is None and not self.should_stop_execution:
-            pass
+        # attendre que l'utilisateur ait déplacé ses pièces
+        self.wait_action_performed()
         self.can_act = False
+        self.legal_moves = None
         try:
             MainThreadExecutor.shared.run(self.delegate.played)
         except AttributeError:
@@ -64,9 +101,11 @@ class HumanGuiPlayer(GuiPlayer, BoardSceneDelegate):
         méthode de BoardSceneDelegate qui est appelée par BoardScene.
         Renvoie les cases de destination possibles pour la reine donnée
         """
+        legal_moves = self.legal_moves
+        if legal_moves is None:
+            return []
         queen_coord = to_game_coord(self.board.size, coord)
-        moves = list(self.board._possible_moves_from(queen_coord))
-        return [to_ui_coord(self.board.size, m) for m in moves]
+        return [to_ui_coord(self.board.size, m) for m in legal_moves.destinations(queen_coord)]
 
     def piece_moved(self, from_coord, to_coord) -> [tuple]:
         """
@@ -75,10 +114,13 @@ class HumanGuiPlayer(GuiPlayer, BoardSceneDelegate):
         Renvoie les cases de destination possibles pour une flèche d'une reine venant de from_coord qui
         s'est déplacée en to_coord
         """
+        legal_moves = self.legal_moves
+        if legal_moves is None:
+            return []
         queen_init_coords = to_game_coord(self.board.size, from_coord)
         queen_final_coord = to_game_coord(self.board.size, to_coord)
 
-        possible_arr_positions = list(self.board._possible_moves_from(queen_final_coord, queen_init_coords))
+        possible_arr_positions = legal_moves.arrow_destinations(queen_init_coords, queen_final_coord)
 
         return [to_ui_coord(self.board.size, pos) for pos in possible_arr_positions]
 
@@ -88,34 +130,10 @@ class HumanGuiPlayer(GuiPlayer, BoardSceneDelegate):
 
         Renvoie si l'action est valide
         """
-        if not self.can_act:
+        legal_moves = self.legal_moves
+        if not self.can_act or legal_moves is None:
             return False
-        queen_from_bd = to_game_coord(self.board.size, queen_from)
-        queen_to_bd = to_game_coord(self.board.size, queen_to)
-        arr_bd = to_game_coord(self.board.size, arr)
-
-        try:
-            player = self.board.grid[queen_from_bd]
-        except IndexError:
-            print("Invalid queen position")
-            return False
-
-        try:
-            action = Action(queen_from_bd, queen_to_bd, arr_bd, player)
-        except Exception:
-            print("This is not an action")
-            return False
-
-        try:
-            self.board.act(action)
-        except Exception:
-            print("Action is invalid")
-            return False
-        else:
-            # l'action est valide!
-            self.board.undo()
-
-            return True
+        return legal_moves.is_legal(*(to_game_coord(self.board.size, pos) for pos in (queen_from, queen_to, arr)))
 
     def perform_action(self, queen_from, queen_to, arr):
         """
@@ -125,38 +143,80 @@ class HumanGuiPlayer(GuiPlayer, BoardSceneDelegate):
         """
         self.action = Action(*[to_game_coord(self.board.size, pos)
                                for pos in (queen_from, queen_to, arr)], self.player_id)
+        self.action_performed.set()
 
 
-class AIGuiPlayer(GuiPlayer, AIPlayer, BoardSceneDelegate):
-    """Classe représentant un joueur IA jouant avec à travers une interface graphique"""
-    def __init__(self, ai_ai_delay, *args, **kwargs):
-        super(AIGuiPlayer, self).__init__(*args, **kwargs)
+class AIGuiPlayer(GuiPlayer, BoardSceneDelegate):
+    """
+    Classe représentant un joueur IA jouant à travers une interface graphique. La recherche a lieu dans un processus
+    séparé (c.f. EngineProcess) pour ne pas ralentir l'interface.
+
+    Attributes:
+        engine (EngineProcess): le moteur de l'IA
+        board_cursor (BoardCursor): le curseur du moteur sur l'historique de board
+    """
+    def __init__(self, ai_ai_delay, board, player_id, timeout=2):
+        super(AIGuiPlayer, self).__init__(board, player_id)
         self.ai_ai_delay = ai_ai_delay
+        self.timeout = timeout
         self.action_start_time = None
 
-        self.can_return_action = False
+        self.board_cursor = board.cursor()
+        self.engine = EngineProcess(board, player_id, timeout)
+
+    @GuiPlayer.should_stop_execution.setter
+    def should_stop_execution(self, value):
+        GuiPlayer.should_stop_execution.fset(self, value)
+        if value:
+            self.engine.close()  # la recherche en cours est annulée et le processus du moteur s'arrête
 
     def _play(self):
         """
-        Appelle AIGuiPlayer pour avoir l'action de l'IA et attend que l'action soit appliquée sur la GUI avant
-        de la renvoyer
+        Demande l'action au moteur de l'IA et attend que l'action soit appliquée sur la GUI avant de la renvoyer
         """
         self.action_start_time = time()
         self.board_scene.stop_all_possible_interaction()
-        action = super(AIGuiPlayer, self)._play()
-        self.can_return_action = False
-
-        while not (time() - self.action_start_time >= self.ai_ai_delay or
-                   self.should_stop_execution):
-            pass
+        try:
+            action = self.engine.play(*self.board_cursor.changes())
+        except EngineError as e:
+            print(e, file=sys.stderr)
+            self._report_engine_failure(str(e))
+            return None
+        if action is None:
+            # le processus du moteur s'est arrêté de lui-même si l'arrêt n'a pas été demandé
+            self._report_engine_failure()
+            return None
+        self.action_performed.clear()
+
+        # attendre la fin du délai entre deux IA, interrompu si le joueur doit s'arrêter
+        self.stopped.wait(max(0, self.ai_ai_delay - (time() - self.action_start_time)))
         try:
             MainThreadExecutor.shared.run(self.delegate.played, action)
         except AttributeError:
             pass
-        while not (self.can_return_action or self.should_stop_execution):
-            pass
+        self.wait_action_performed()
         return action
 
+    def _report_engine_failure(self, details=None):
+        """
+        Signale au delegate que le moteur n'a pas renvoyé d'action alors que le joueur n'a pas été arrêté: la partie ne
+        peut pas continuer et le joueur est arrêté
+
+        Args:
+            details (str): la trace de l'erreur du moteur, None si le processus s'est arrêté sans erreur
+        """
+        if self.should_stop_execution:
+            return
+        try:
+            self.delegate.engine_failed(self.player_id, details)
+        except AttributeError:
+            pass
+        self.should_stop_execution = True
+
+    def new_for_board(self, board):
+        """AIGuiPlayer: renvoie un nouveau joueur avec le même délai et le même id pour le plateau board"""
+        return AIGuiPlayer(self.ai_ai_delay, board, self.player_id, self.timeout)
+
     def piece_selected(self, coord) -> [tuple]:
         """
         méthode de BoardSceneDelegate qui est appelée par BoardScene.
@@ -185,10 +245,10 @@ class AIGuiPlayer(GuiPlayer, AIPlayer, BoardSceneDelegate):
         """
         méthode de BoardSceneDelegate qui est appelée par BoardScene.
 
-        La GUI a effectué l'action, mettre can_return_action à True pour pouvoir retourner l'action
+        La GUI a effectué l'action, l'action peut être renvoyée
         """
         # attendre que la gui ait fini l'animation avant d'appliquer le coup à Amazons
-        self.can_return_action = True
+        self.action_performed.set()
 
 
 class GuiPlayerDelegate:
@@ -196,3 +256,13 @@ class GuiPlayerDelegate:
     def played(self, action):
         """Est appelé lorsqu'une action a été jouée"""
         raise NotImplemented
+
+    def engine_failed(self, player_id, details=None):
+        """
+        Est appelé lorsque le moteur de l'IA player_id s'est arrêté sans renvoyer d'action
+
+        Args:
+            player_id (int): l'id du joueur de l'IA
+            details (str): la trace de l'erreur du moteur, None si le processus s'est arrêté sans erreur
+        """
+        raise NotImplementedError
@@ -5,30 +5,13 @@ Matricule:  521935
 """
 
 from src.models.board import Board
+from src.models.board_file import load_board_file
 from src.models.players import *
 from src.const import *
 
-def extract_positions(line):
-    """
-    Récupère la liste de positions dans line
-
-    Args:
-        line (str): string sous la forme '<pos1>,<pos2>,<pos3>,...,<posn>'
-
-    Returns:
-        list: liste d'instances de Pos2D
-
-    Raises:
-        InvalidFormatError: si la ligne est vide
-    """
-    if line == '':
-        raise InvalidFormatError('Liste de positions vide')
-    else:
-        return line.strip().split(',')
-
 def read_file(path):
     """
-    Récupère les informations stockées dans le fichier donné
+    Récupère les informations stockées dans le fichier donné (c.f. board_file.load_board_file)
 
     Args:
         path (str): chemin vers un fichier de format de plateau
@@ -38,22 +21,9 @@ def read_file(path):
 
     Raises:
         InvalidFormatError: si le format du fichier est invalide
+        InvalidPositionError: si une position est invalide, en dehors du plateau ou utilisée plusieurs fois
     """
-    with open(path, 'r') as f:
-        try:
-            size = int(f.readline().strip())
-        except ValueError:  # Si la première ligne n'est pas un entier
-            raise InvalidFormatError('La taille du plateau n\'est pas donnée')
-        pos_black = extract_positions(f.readline())
-        pos_white = extract_positions(f.readline())
-        # on récupère la liste des positions des flèches
-        try:
-            pos_arrows = extract_positions(f.readline())
-        except InvalidFormatError:
-            pos_arrows = []
-        if f.readline() != '':  # S'il reste du texte dans le fichier
-            raise InvalidFormatError('Format invalide: informations après les flèches')
-    return size, pos_black, pos_white, pos_arrows
+    return load_board_file(path)
 
 class Amazons:
     """
@@ -65,12 +35,13 @@ class Amazons:
         current_player_idx (int): indice du joueur dont c'est le tour
         status (EndOfGameStatus): état de la fin de partie
     """
-    def __init__(self, path, delegate=None, show_text_board=True):
+    def __init__(self, path=None, delegate=None, show_text_board=True, board=None):
         """
         Args:
             path (str): chemin vers le fichier représentant le plateau
+            board (Board): le plateau de jeu, à la place de path
         """
-        self.board = Board(*read_file(path))
+        self.board = Board(*read_file(path)) if board is None else board
         self.players = (HumanPlayer(self.board, PLAYER_1), HumanPlayer(self.board, PLAYER_2))
         self.current_player_idx = 0
         self.status = None
@@ -110,6 +81,18 @@ class Amazons:
                 print(self.board)  # On affiche le plateau après le dernier coup
                 self.show_winner()  # On montre qui a gagné
 
+    def new_game(self):
+        """
+        Crée une nouvelle partie depuis la position de départ de celle-ci, sans copier la partie en cours: le plateau
+        est reconstruit depuis son premier instantané et chaque joueur est remplacé par un nouveau joueur du même type
+
+        Returns:
+            Amazons: la nouvelle partie
+        """
+        game = Amazons(delegate=self.delegate, show_text_board=self.show_text_board, board=self.board.copy_at(0))
+        game.players = tuple(player.new_for_board(game.board) for player in self.players)
+        return game
+
     def is_over(self):
         """
         Détermine si la partie est terminée
@@ -0,0 +1,148 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import importlib.util
+import threading
+import numpy as np
+from src.const import *
+from src.models import numpy_moves
+
+# Évaluation de piles de positions (B, N, N): mêmes heuristiques et même fonction économique que
+# FastBoard.heuristics_linear_comb, calculées en parallèle avec numba ou, sans numba, vectorisées avec numpy.
+
+NUMBA = 'numba'
+NUMPY = 'numpy'
+BACKENDS = (NUMBA, NUMPY)
+
+_DIRECTIONS = np.array(numpy_moves.DIRECTIONS, dtype=np.int8)
+
+_kernel = None
+_kernel_lock = threading.Lock()
+
+
+def _numba_kernel():
+    # importe (et donc compile ou charge depuis le cache) le noyau parallèle au premier appel, lève ImportError
+    # sans numba
+    global _kernel
+    with _kernel_lock:
+        if _kernel is None:
+            from os.path import join
+            from src.models.numba_aot.engine import configure_cache, file_lock
+            cache_dir = configure_cache()
+            with file_lock(join(cache_dir, 'batch_kernel.lock')):
+                from src.models.batch_kernel import evaluate_batch
+            _kernel = evaluate_batch
+    return _kernel
+
+
+def default_backend():
+    """str: renvoie NUMBA si numba est disponible, sinon NUMPY"""
+    return NUMBA if importlib.util.find_spec('numba') is not None else NUMPY
+
+
+def _evaluate_numba(grids, players, turns, coefs):
+    components = np.empty((len(grids), 4), dtype=np.int64)
+    scores = np.empty(len(grids), dtype=np.int64)
+    _numba_kernel()(_DIRECTIONS, grids.shape[-1], grids, players, turns, coefs, components, scores)
+    return components, scores
+
+
+def _evaluate_numpy(grids, players, turns, coefs):
+    # mobilité et portée des deux joueurs sur toute la pile, puis sélection du point de vue de chaque plateau
+    is_player_1 = players == PLAYER_1
+    mobilities = [numpy_moves.queen_moves(grids, p)[1].sum(axis=1) for p in PLAYERS]
+    levels = [numpy_moves.reachability(grids, p) for p in PLAYERS]
+    this = np.where(is_player_1[:, None, None], levels[PLAYER_1], levels[PLAYER_2]).astype(np.int64)
+    other = np.where(is_player_1[:, None, None], levels[PLAYER_2], levels[PLAYER_1]).astype(np.int64)
+
+    axes = (1, 2)
+    this_reached = this > 0
+    other_reached = other > 0
+    both = this_reached & other_reached
+    only_this = np.count_nonzero(this_reached & ~other_reached, axis=axes)
+    only_other = np.count_nonzero(other_reached & ~this_reached, axis=axes)
+    closer_this = np.count_nonzero(both & (this < other), axis=axes)
+    closer_other = np.count_nonzero(both & (other < this), axis=axes)
+    ties = np.count_nonzero(both & (this == other), axis=axes)
+
+    components = np.empty((len(grids), 4), dtype=np.int64)
+    components[:, 0] = np.where(is_player_1, mobilities[PLAYER_1] - mobilities[PLAYER_2],
+                                mobilities[PLAYER_2] - mobilities[PLAYER_1])
+    # case atteinte en autant de mouvements: avantage au joueur dont c'est le tour
+    components[:, 1] = (4 * (only_this + closer_this - only_other - closer_other) + np.where(turns, ties, -ties)) // 4
+    components[:, 2] = np.count_nonzero(this_reached, axis=axes) - np.count_nonzero(other_reached, axis=axes)
+    components[:, 3] = 4 * (only_this - only_other) + np.where(both, other - this, 0).sum(axis=axes)
+    return components, components @ coefs
+
+
+def evaluate_positions(grids, side_to_move, viewpoint=None, coefs=EVALUATION_COEFS_DEFAULT, backend=None):
+    """
+    Évalue une pile de positions
+
+    Args:
+        grids (np.ndarray): les plateaux (B, N, N) (valeurs de src.const: PLAYER_1, PLAYER_2, EMPTY, ARROW)
+        side_to_move (int ou np.ndarray): le joueur qui doit jouer sur chaque plateau (B,) (ou sur tous)
+        viewpoint (int ou np.ndarray): le joueur du point de vue duquel chaque plateau est évalué
+                                       (None: side_to_move)
+        coefs (tuple): les coefficients (mobilité, territoire, portée, territoire relatif) de la fonction économique
+        backend (str): NUMBA ou NUMPY (None: default_backend())
+
+    Returns:
+        tuple: (components, scores) où components (B, 4) contient les heuristiques (mobilité, territoire, portée,
+               territoire relatif) et scores (B,) la fonction économique de chaque plateau, comme
+               FastBoard.heuristics et FastBoard.heuristics_linear_comb
+    """
+    grids = np.ascontiguousarray(grids, dtype=np.int8)
+    if grids.ndim != 3 or grids.shape[1] != grids.shape[2]:
+        raise ValueError("grids doit être de forme (B, N, N)")
+    side_to_move = np.broadcast_to(np.asarray(side_to_move, dtype=np.int8), len(grids))
+    viewpoint = side_to_move if viewpoint is None else np.broadcast_to(np.asarray(viewpoint, dtype=np.int8),
+                                                                        len(grids))
+    players = np.array(viewpoint)  # copie: broadcast_to renvoie une vue en lecture seule
+    turns = viewpoint == side_to_move
+    coefs = np.asarray(coefs, dtype=np.int64)
+
+    backend = default_backend() if backend is None else backend
+    if backend == NUMBA:
+        return _evaluate_numba(grids, players, turns, coefs)
+    elif backend == NUMPY:
+        return _evaluate_numpy(grids, players, turns, coefs)
+    raise ValueError(f"backend inconnu: {backend} (parmi {BACKENDS})")
+
+
+def iter_chunks(grids, side_to_move, chunk_size=EVALUATION_CHUNK_SIZE_DEFAULT, viewpoint=None):
+    """
+    Découpe une pile de positions (ex: np.memmap trop grand pour la mémoire) en morceaux de chunk_size plateaux
+
+    Returns:
+        generator de (grids, side_to_move, viewpoint), viewpoint étant None si aucun point de vue n'est donné
+    """
+    side_to_move = np.broadcast_to(np.asarray(side_to_move), len(grids))
+    if viewpoint is not None:
+        viewpoint = np.broadcast_to(np.asarray(viewpoint), len(grids))
+    for start in range(0, len(grids), chunk_size):
+        end = start + chunk_size
+        yield np.asarray(grids[start:end]), side_to_move[start:end], None if viewpoint is None else viewpoint[start:end]
+
+
+def evaluate_stream(chunks, viewpoint=None, coefs=EVALUATION_COEFS_DEFAULT, backend=None):
+    """
+    Évalue des positions fournies morceau par morceau, sans jamais les charger toutes en mémoire
+
+    Args:
+        chunks (iterable): des (grids, side_to_move) ou (grids, side_to_move, viewpoint) (c.f. evaluate_positions et
+                           iter_chunks), le point de vue d'un morceau remplace viewpoint s'il n'est pas None
+        viewpoint (int): le joueur du point de vue duquel tous les plateaux sont évalués (None: side_to_move)
+
+    Returns:
+        generator de (components, scores), un par morceau
+    """
+    for grids, side_to_move, *chunk_viewpoint in chunks:
+        if chunk_viewpoint and chunk_viewpoint[0] is not None:
+            chunk_viewpoint = chunk_viewpoint[0]
+        else:
+            chunk_viewpoint = viewpoint
+        yield evaluate_positions(grids, side_to_move, chunk_viewpoint, coefs=coefs, backend=backend)
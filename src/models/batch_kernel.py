@@ -0,0 +1,30 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import numpy as np
+from numba import njit, prange
+from src.models.numba_aot.fast_board_aot_compiler import evaluation_components
+
+# noyau parallèle de batch_evaluation, dans son propre module pour que numba ne soit importé (et le noyau compilé
+# ou chargé depuis le cache) que lorsqu'il est utilisé (c.f. batch_evaluation._numba_kernel)
+
+
+@njit('void(int8[:, :], int64, int8[:, :, :], int8[:], boolean[:], int64[:], int64[:, :], int64[:])',
+      parallel=True, cache=True)
+def evaluate_batch(DIR, N, grids, players, turns, coefs, components, scores):
+    """
+    Écrit dans components (B, 4) les heuristiques et dans scores (B,) la fonction économique de chaque plateau de
+    grids (B, N, N) du point de vue de players (B,), turns (B,) indiquant si c'est à ce joueur de jouer
+    """
+    for b in prange(grids.shape[0]):
+        # tableaux de travail propres à chaque itération (les itérations sont réparties entre threads)
+        reachability = np.zeros((2, N, N), dtype=np.int8)
+        queue = np.empty((N * N, 2), dtype=np.int8)
+        evaluation_components(DIR, N, grids[b], players[b], turns[b], reachability, queue, components[b])
+        score = 0
+        for k in range(4):
+            score += coefs[k] * components[b, k]
+        scores[b] = score
@@ -0,0 +1,444 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import random
+from src.const import *
+from src.models.action import Action
+from src.models.board import EndOfGameStatus
+from src.models.pos2d import Pos2D
+
+# mêmes directions, dans le même ordre, que FastBoard.DIRECTIONS: les mouvements sont générés dans le même ordre
+DIRECTIONS = [(i, j) for i in range(-1, 2, 1) for j in range(-1, 2, 1) if not 0 == i == j]
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # python < 3.10
+    def popcount(mask):
+        return bin(mask).count('1')
+
+
+class RayTables:
+    """
+    Tables des rayons d'un plateau N x N, partagées par tous les BitBoard de même taille.
+    La case (i, j) correspond au bit i * N + j.
+
+    Attributes:
+        positions (list): la position (i, j) de chaque bit
+        rays (list): pour chaque case, les rayons non vides sous forme de listes de (bit, position), du plus proche
+                     au plus éloigné, dans l'ordre de DIRECTIONS
+        ray_masks (list): pour chaque case, les rayons non vides sous forme de (masque, sens) où sens est True si les
+                          indices des cases augmentent en s'éloignant
+    """
+    _tables = {}
+
+    def __init__(self, N):
+        self.positions = [(i, j) for i in range(N) for j in range(N)]
+        self.rays = []
+        self.ray_masks = []
+        for i, j in self.positions:
+            rays = []
+            ray_masks = []
+            for di, dj in DIRECTIONS:
+                ray = []
+                y, x = i + di, j + dj
+                while 0 <= y < N and 0 <= x < N:
+                    ray.append((1 << (y * N + x), (y, x)))
+                    y, x = y + di, x + dj
+                if ray:
+                    rays.append(ray)
+                    mask = 0
+                    for bit, _ in ray:
+                        mask |= bit
+                    ray_masks.append((mask, di * N + dj > 0))
+            self.rays.append(rays)
+            self.ray_masks.append(ray_masks)
+
+    @classmethod
+    def of_size(cls, N):
+        """RayTables: renvoie les tables d'un plateau N x N (calculées une seule fois par taille)"""
+        try:
+            return cls._tables[N]
+        except KeyError:
+            tables = cls._tables[N] = cls(N)
+            return tables
+
+
+class BitBoard:
+    """
+    Plateau rapide en Python pur, utilisé à la place de FastBoard lorsque numba (ou numpy) n'est pas disponible.
+    Les cases occupées sont un entier dont le bit i * N + j correspond à la case (i, j). Les mouvements sont générés
+    en parcourant des rayons pré-calculés et la fonction économique calcule la portée des reines par masques de bits.
+
+    L'interface est celle de FastBoard, à l'exception de possible_actions_array: MCTSPlayer nécessite numpy.
+    """
+
+    def __init__(self, board, player):
+        self.N = board.N
+        self.num_tiles = self.N ** 2
+        self.tables = RayTables.of_size(self.N)
+
+        self.history = []
+
+        self.grid = [list(row) for row in board.grid.grid]
+        self.queens = [[(i, j) for i in range(self.N) for j in range(self.N) if self.grid[i][j] == q]
+                       for q in (PLAYER_1, PLAYER_2)]
+        self.blocked = 0  # cases non vides
+        for i in range(self.N):
+            for j in range(self.N):
+                if self.grid[i][j] != EMPTY:
+                    self.blocked |= 1 << (i * self.N + j)
+
+        self.player = player
+        self.other_player = PLAYER_1 if player == PLAYER_2 else PLAYER_2
+
+        # même clé de Zobrist que FastBoard (c.f. FastBoard.__init__)
+        zobrist_random = random.Random(ZOBRIST_SEED)
+        self._zobrist = [[[zobrist_random.getrandbits(63) for _ in range(self.N)] for _ in range(self.N)]
+                         for _ in range(len(CHARS))]
+        self.key = 0
+        for i in range(self.N):
+            for j in range(self.N):
+                self.key ^= self._zobrist[self.grid[i][j]][i][j]
+
+        # caches propres à l'instance: clé des arguments -> (clé de la position, résultat), c.f. FastBoard
+        self._possible_moves_cache = {}
+        self._possible_actions_cache = {}
+        self._has_moves_cache = {}
+
+    @staticmethod
+    def engine_description():
+        """str: décrit le moteur utilisé par ce plateau"""
+        return "Python pur (BitBoard)"
+
+    def _set(self, pos, value):
+        # modifie une case du plateau en mettant à jour la clé de la position et les cases occupées
+        i, j = pos
+        self.key ^= self._zobrist[self.grid[i][j]][i][j] ^ self._zobrist[value][i][j]
+        self.grid[i][j] = value
+        bit = 1 << (i * self.N + j)
+        if value == EMPTY:
+            self.blocked &= ~bit
+        else:
+            self.blocked |= bit
+
+    def is_current_player_turn(self):
+        """bool: renovie si c'est au joueur actuel de joueur"""
+        if self.history:
+            return self.history[-1][-1] == self.other_player
+        return self.player == PLAYER_1
+
+    @property
+    def status(self):
+        """EndOfGameStatus: renvoie l'état du jeu"""
+        scores = []
+        for p in (PLAYER_1, PLAYER_2):
+            scores.append(self.has_moves(p))
+        if all(scores):
+            return EndOfGameStatus()
+        else:
+            return EndOfGameStatus(*map(int, scores))
+
+    def _attacks(self, pos, blocked):
+        # masque des cases atteignables depuis pos en un mouvement
+        res = 0
+        for mask, increasing in self.tables.ray_masks[pos[0] * self.N + pos[1]]:
+            hit = mask & blocked
+            if not hit:
+                res |= mask
+            elif increasing:  # l'obstacle le plus proche est le bit le plus faible
+                res |= mask & ((hit & -hit) - 1)
+            else:  # l'obstacle le plus proche est le bit le plus fort
+                res |= mask & ~((1 << hit.bit_length()) - 1)
+        return res
+
+    def _reachability_levels(self, player):
+        # masques des cases atteintes pour la première fois en 1, 2, 3, ... mouvements par les reines de player
+        blocked = self.blocked
+        positions = self.tables.positions
+        levels = []
+        visited = 0
+        frontier = self.queens[player]
+        while frontier:
+            new = 0
+            for pos in frontier:
+                new |= self._attacks(pos, blocked)
+            new &= ~visited
+            if not new:
+                break
+            visited |= new
+            levels.append(new)
+            frontier = []
+            while new:
+                low = new & -new
+                frontier.append(positions[low.bit_length() - 1])
+                new ^= low
+        return levels
+
+    @staticmethod
+    def _compare_levels(this_levels, other_levels):
+        # renvoie (balance, égalités, portée, territoire relatif) où balance est le nombre de cases atteintes en moins
+        # de mouvements par this que par other moins l'inverse et égalités le nombre de cases atteintes en autant de
+        # mouvements (c.f. fast_board_aot_compiler.evaluation_components)
+        this_all = 0
+        for level in this_levels:
+            this_all |= level
+        other_all = 0
+        for level in other_levels:
+            other_all |= level
+        both = this_all & other_all
+
+        balance = popcount(this_all & ~other_all) - popcount(other_all & ~this_all)
+        relative_territory = 4 * balance
+        ties = 0
+        this_within = 0
+        other_within = 0
+        for distance in range(1, max(len(this_levels), len(other_levels)) + 1):
+            this_level = this_levels[distance - 1] & both if distance <= len(this_levels) else 0
+            other_level = other_levels[distance - 1] & both if distance <= len(other_levels) else 0
+            this_within |= this_level
+            other_within |= other_level
+            balance += popcount(this_level & ~other_within) - popcount(other_level & ~this_within)
+            relative_territory += distance * (popcount(other_level) - popcount(this_level))
+            ties += popcount(this_level & other_level)
+
+        reachability = popcount(this_all) - popcount(other_all)
+        return balance, ties, reachability, relative_territory
+
+    def heuristics(self):
+        """tuple: Renvoie les heuristiques (mobilité, territoire, portée, territoire relatif) du plateau"""
+        return (self.mobility(),) + self.territory_reachability()
+
+    def heuristics_linear_comb(self, mobility_coef=2, terr_coef=8, reach_coef=8, relative_terr_coef=2):
+        """int: Renvoie la combinaison linéaire des heuristiques"""
+        mobility, territory, reachability, relative_territory = self.heuristics()
+        return mobility_coef * mobility + terr_coef * territory + reach_coef * reachability \
+            + relative_terr_coef * relative_territory
+
+    def mobility(self):
+        """return: int: le nombre total de mouvements que le joueur peut faire (pas actions!)"""
+        res = 0
+        for queen in self.queens[self.player]:
+            res += popcount(self._attacks(queen, self.blocked))
+        for queen in self.queens[self.other_player]:
+            res -= popcount(self._attacks(queen, self.blocked))
+        return res
+
+    def territory_reachability(self):
+        """
+        Renvoie la différence entre le nombre de cases qui appartiennent à chaque joueur, la différence entre les
+        cases atteignables et le territoire relatif (c.f. FastBoard.territory_reachability)
+        return: (int, int, int)
+        """
+        balance, ties, reachability, relative_territory = self._compare_levels(
+            self._reachability_levels(self.player), self._reachability_levels(self.other_player))
+        # case atteinte en autant de mouvements: avantage au joueur dont c'est le tour
+        territory = (4 * balance + (ties if self.is_current_player_turn() else -ties)) // 4
+        return territory, reachability, relative_territory
+
+    @staticmethod
+    def seq_action_to_action(seq_action, player):
+        """
+        action_seq: convertit la séquence sous forme ((from_y, from_x), (to_y, to_x), (arr_y, arr_x)) en Action
+        player: int: l'id du joueur actuel
+
+        return: Action
+        """
+        return Action(Pos2D(*seq_action[0]), Pos2D(*seq_action[1]), Pos2D(*seq_action[2]), player)
+
+    def act(self, from_pos, to_pos, arr_pos, player):
+        """
+        Effectue l'action donnée
+        from_pos: séquence de taille 2
+        to_pos: séquence de taille 2
+        arr_pos: séquence de taille 2
+        player: int: l'id du joueur
+        """
+        from_pos, to_pos, arr_pos = tuple(from_pos), tuple(to_pos), tuple(arr_pos)
+        self.history.append((from_pos, to_pos, arr_pos, player))
+
+        self._set(from_pos, EMPTY)
+        self._set(to_pos, player)
+        self._set(arr_pos, ARROW)  # après from_pos si jamais arr_pos == from_pos
+
+        self.queens[player][self.queens[player].index(from_pos)] = to_pos
+
+    def act_action(self, action):
+        """Effectue l'Action action"""
+        from_pos = action.old_pos.y, action.old_pos.x
+        to_pos = action.new_pos.y, action.new_pos.x
+        arr_pos = action.arrow_pos.y, action.arrow_pos.x
+        self.act(from_pos, to_pos, arr_pos, action.player_id)
+
+    def undo(self):
+        """Annule la dernière action effectuée"""
+        from_pos, to_pos, arr_pos, player = self.history.pop()
+
+        self._set(arr_pos, EMPTY)
+        self._set(to_pos, EMPTY)
+        self._set(from_pos, player)
+
+        self.queens[player][self.queens[player].index(to_pos)] = from_pos
+
+    def last_moved_queen_influence(self):
+        """Renvoie le nombre de mouvements possibles de la dernière reine déplacée"""
+        try:
+            queen = self.history[-1][0]
+        except IndexError:
+            return 0
+        return popcount(self._attacks(queen, self.blocked))
+
+    def mobility_evaluation(self):
+        """Renvoie la différence entre le nombre d'actions possibles des reines"""
+        return len(self.possible_actions(self.player)) - len(self.possible_actions(self.other_player))
+
+    def has_moves(self, player):
+        """Fonction booléenne qui renvoie si le joueur player peut joueur"""
+        cached = self._has_moves_cache.get(player)
+        if cached is not None and cached[0] == self.key:
+            return cached[1]
+        res = len(self.possible_actions(player, return_first_found=True)) > 0
+        self._has_moves_cache[player] = (self.key, res)
+        return res
+
+    def __repr__(self):
+        res = ''
+        for col in self.grid[::-1]:
+            for cell in col:
+                res += CHARS[cell] + ' '
+            res += '\n'
+        return res
+
+    def possible_moves_numba(self, from_pos, ignore_pos=None, return_first_found=False):
+        """
+        Renvoie les mouvements possibles à partir de from_pos, dans le même ordre que FastBoard
+        (le nom est celui de la méthode de FastBoard)
+        """
+        cache_key = (from_pos, ignore_pos, return_first_found)
+        cached = self._possible_moves_cache.get(cache_key)
+        if cached is not None and cached[0] == self.key:
+            return cached[1]
+
+        blocked = self.blocked
+        if ignore_pos:
+            blocked &= ~(1 << (ignore_pos[0] * self.N + ignore_pos[1]))
+        moves = []
+        for ray in self.tables.rays[from_pos[0] * self.N + from_pos[1]]:
+            for bit, pos in ray:
+                if blocked & bit:
+                    break
+                moves.append(pos)
+                if return_first_found:
+                    break
+            if return_first_found and moves:
+                break
+        res = tuple(moves)
+        self._possible_moves_cache[cache_key] = (self.key, res)
+        return res
+
+    def iter_actions(self, player, queens=None):
+        """
+        Génère une à une les actions possibles pour un joueur.
+        Les flèches d'un mouvement de reine ne sont calculées qu'une fois que ce mouvement est atteint.
+
+        player: int: l'id du joueur
+        queens: liste des reines dans l'ordre dans lequel leurs actions doivent être générées (None: self.queens)
+
+        return: generator de (queen, queen_move, arr_move)
+        """
+        for queen in list(self.queens[player] if queens is None else queens):
+            for queen_move in self.possible_moves_numba(queen):
+                for arr_move in self.possible_moves_numba(queen_move, ignore_pos=queen):
+                    yield queen, queen_move, arr_move
+
+    def is_legal_action(self, action, player):
+        """bool: renvoie si l'action (from, to, arrow) peut être jouée par player"""
+        from_pos, to_pos, arr_pos = action
+        return self.grid[from_pos[0]][from_pos[1]] == player \
+            and to_pos in self.possible_moves_numba(from_pos) \
+            and arr_pos in self.possible_moves_numba(to_pos, ignore_pos=from_pos)
+
+    def possible_actions(self, player, return_first_found=False):
+        """Renvoie toutes les actions possibles pour un joueur sous forme de liste"""
+        cache_key = (player, return_first_found)
+        cached = self._possible_actions_cache.get(cache_key)
+        if cached is not None and cached[0] == self.key:
+            return cached[1]
+        res = self._possible_actions(player, return_first_found)
+        self._possible_actions_cache[cache_key] = (self.key, res)
+        return res
+
+    def _possible_actions(self, player, return_first_found):
+        actions = []
+        for queen in self.queens[player]:
+            for queen_move in self.possible_moves_numba(queen):
+                for arr_move in self.possible_moves_numba(queen_move, ignore_pos=queen,
+                                                          return_first_found=return_first_found):
+                    res = (queen, queen_move, arr_move)
+                    if return_first_found:
+                        return res
+                    actions.append(res)
+        return actions
+
+    def _random_playout(self, rng, player, max_plies):
+        # joue des actions aléatoires à partir du tour de player et renvoie le gagnant, puis annule ces actions
+        # (c.f. fast_board_aot_compiler.random_playout)
+        plies = 0
+        winner = None
+        while max_plies <= 0 or plies < max_plies:
+            queens = self.queens[player]
+            first_queen = rng.randrange(len(queens)) if queens else 0
+            moves = ()
+            queen = None
+            for k in range(len(queens)):
+                queen = queens[(first_queen + k) % len(queens)]
+                moves = self.possible_moves_numba(queen)
+                if moves:
+                    break
+            if not moves:
+                winner = 1 - player
+                break
+            to_pos = rng.choice(moves)
+            arr_pos = rng.choice(self.possible_moves_numba(to_pos, ignore_pos=queen))
+            self.act(queen, to_pos, arr_pos, player)
+            player = 1 - player
+            plies += 1
+        if winner is None:
+            balance = self._compare_levels(self._reachability_levels(player),
+                                           self._reachability_levels(1 - player))[0]
+            winner = player if balance > 0 else 1 - player
+        for _ in range(plies):
+            self.undo()
+        return winner
+
+    def random_playouts(self, player, count, seed, max_plies=0):
+        """
+        Joue count parties aléatoires depuis la position actuelle où c'est au tour de player
+
+        Returns:
+            int: le nombre de parties gagnées par player
+        """
+        rng = random.Random(seed)
+        return sum(self._random_playout(rng, player, max_plies) == player for _ in range(count))
+
+    def first_move_statistics(self, player, count, seed, max_plies=0):
+        """
+        Joue count parties aléatoires réparties équitablement entre toutes les actions possibles de player
+
+        Returns:
+            tuple: (actions, stats) où actions est la liste des actions possibles et stats la liste des
+                   [nombre de parties, nombre de victoires de player] pour chacune de ces actions
+        """
+        rng = random.Random(seed)
+        actions = list(self.possible_actions(player))
+        stats = [[0, 0] for _ in actions]
+        for k in range(count if actions else 0):
+            a = k % len(actions)
+            self.act(*actions[a], player)
+            winner = self._random_playout(rng, 1 - player, max_plies)
+            self.undo()
+            stats[a][0] += 1
+            stats[a][1] += winner == player
+        return actions, stats
@@ -60,12 +60,16 @@ class Board:
         N (int): dimension du plateau
         grid (Matrix): la grill du plateau de jeu en lui-même
         history (list): historique des coups joués sur le plateau
+        cursors (list): les curseurs (BoardCursor) des observateurs du plateau
         queens (list): conteneur des positions des reines de chacun des joueurs
         nb_arrows (int): nombre de flèches présentes sur le plateau
         scores (list): score de chaque joueur
+        snapshot_interval (int): nombre d'actions entre deux instantanés
+        snapshots (list): les instantanés (BoardSnapshot) du plateau après 0, snapshot_interval, 2*snapshot_interval,
+                          ... actions de l'historique
     """
     #                     PLAYER_2   PLAYER_1
-    def __init__(self, N, pos_black, pos_white, pos_arrows):
+    def __init__(self, N, pos_black, pos_white, pos_arrows, snapshot_interval=SNAPSHOT_INTERVAL_DEFAULT):
         self.N = N
         self.letters = ' '.join(map(chr, range(ord('a'), ord('a')+self.N)))
         self.grid = Matrix(self.N, EMPTY)
@@ -76,6 +80,9 @@ class Board:
         self.queens = [list(map(Pos2D.from_string, positions)) for positions in (pos_white, pos_black)]
         self.nb_arrows = len(pos_arrows)
         self.scores = [None, None]  # score of player 1 and player 2
+        self.cursors = []
+        self.snapshot_interval = snapshot_interval
+        self.snapshots = [self.snapshot()]
 
     @property
     def size(self):
@@ -313,6 +320,8 @@ class Board:
         self._shoot_arrow(action.arrow_pos)  # et on tire la flèche
         if log_action:
             self.history.append(action)
+            if len(self.history) % self.snapshot_interval == 0:
+                self.snapshots.append(self.snapshot())
 
     def _move(self, old_pos, new_pos):
         """
@@ -364,6 +373,107 @@ class Board:
         if action.arrow_pos != action.old_pos:
             self.grid[action.arrow_pos] = EMPTY  # et on retire la flèche (si nécessaire)
         self.nb_arrows -= 1
+        self._history_truncated()
+
+    def cursor(self):
+        """
+        Crée un curseur sur l'historique, positionné sur l'état actuel du plateau
+
+        Returns:
+            BoardCursor: le curseur, dont changes() renvoie les modifications faites depuis sa dernière lecture
+        """
+        cursor = BoardCursor(self)
+        self.cursors.append(cursor)
+        return cursor
+
+    def remove_cursor(self, cursor):
+        """Arrête de tenir à jour cursor"""
+        self.cursors.remove(cursor)
+
+    def snapshot(self):
+        """BoardSnapshot: renvoie un instantané de l'état actuel du plateau"""
+        return BoardSnapshot(bytes(cell for row in self.grid.grid for cell in row),
+                             tuple(map(tuple, self.queens)), self.nb_arrows)
+
+    @staticmethod
+    def from_snapshot(N, snapshot, snapshot_interval=SNAPSHOT_INTERVAL_DEFAULT):
+        """
+        Board: crée un plateau de dimension N dans l'état de l'instantané snapshot, avec un historique vide
+        """
+        board = Board(N, [], [], [], snapshot_interval)
+        board._restore(snapshot)
+        board.snapshots = [snapshot]
+        return board
+
+    def _restore(self, snapshot):
+        N = self.N
+        self.grid.grid = [list(snapshot.grid[i:i+N]) for i in range(0, N*N, N)]
+        self.queens = [list(queens) for queens in snapshot.queens]
+        self.nb_arrows = snapshot.nb_arrows
+
+    def _replay(self, actions):
+        # effectue des actions de l'historique, sans les valider ni les ajouter à l'historique
+        for action in actions:
+            self._move(action.old_pos, action.new_pos)
+            self._shoot_arrow(action.arrow_pos)
+
+    def _check_ply(self, ply):
+        if not 0 <= ply <= len(self.history):
+            raise IndexError(f'{ply} n\'est pas un numéro d\'action de l\'historique (0 à {len(self.history)})')
+
+    def seek(self, ply):
+        """
+        Ramène le plateau dans l'état où il était après les ply premières actions de l'historique, depuis l'instantané
+        le plus proche (en au plus snapshot_interval actions, quelle que soit la longueur de la partie)
+
+        Args:
+            ply (int): le nombre d'actions à conserver (0 pour recommencer la partie)
+
+        Returns:
+            list: les actions retirées de l'historique (pour pouvoir les rejouer ensuite)
+
+        Raises:
+            IndexError: si ply n'est pas entre 0 et la longueur de l'historique
+        """
+        self._check_ply(ply)
+        removed = self.history[ply:]
+        start = ply - ply % self.snapshot_interval
+        if len(removed) <= ply - start:  # moins d'actions à annuler qu'à rejouer
+            for _ in removed:
+                self.undo()
+            return removed
+        self._restore(self.snapshots[start // self.snapshot_interval])
+        self._replay(self.history[start:ply])
+        del self.history[ply:]
+        self._history_truncated()
+        return removed
+
+    def copy_at(self, ply):
+        """
+        Crée un plateau dans l'état où était celui-ci après ses ply premières actions (pour analyser une position
+        antérieure sans modifier ce plateau), depuis l'instantané le plus proche
+
+        Returns:
+            Board: le nouveau plateau, avec les ply premières actions de l'historique
+
+        Raises:
+            IndexError: si ply n'est pas entre 0 et la longueur de l'historique
+        """
+        self._check_ply(ply)
+        start = ply - ply % self.snapshot_interval
+        board = Board.from_snapshot(self.N, self.snapshots[start // self.snapshot_interval], self.snapshot_interval)
+        board._replay(self.history[start:ply])
+        board.history = self.history[:ply]
+        board.snapshots = self.snapshots[:ply // self.snapshot_interval + 1]
+        return board
+
+    def _history_truncated(self):
+        # les instantanés des actions retirées ne sont plus valides
+        length = len(self.history)
+        del self.snapshots[length // self.snapshot_interval + 1:]
+        # les actions retirées de l'historique devront être annulées par les observateurs qui les ont lues
+        for cursor in self.cursors:
+            cursor.valid = min(cursor.valid, length)
 
     def is_valid_action(self, action):
         """
@@ -544,3 +654,56 @@ class Board:
         ret += f"{' ':{fill}{align}{width}}{self.letters}"
         return ret
 
+
+class BoardSnapshot:
+    """
+    Instantané compact de l'état d'un plateau (c.f. Board.seek)
+
+    Attributes:
+        grid (bytes): les cases du plateau, ligne par ligne
+        queens (tuple): les positions des reines de chaque joueur
+        nb_arrows (int): nombre de flèches présentes sur le plateau
+    """
+    __slots__ = ('grid', 'queens', 'nb_arrows')
+
+    def __init__(self, grid, queens, nb_arrows):
+        self.grid = grid
+        self.queens = queens
+        self.nb_arrows = nb_arrows
+
+
+class BoardCursor:
+    """
+    Curseur d'un observateur (FastBoard, interface, enregistrement, ...) sur l'historique d'un Board: chaque lecture
+    renvoie exactement les modifications faites depuis la précédente, en O(nombre de modifications), y compris
+    lorsque des actions ont été annulées puis remplacées.
+
+    Attributes:
+        board (Board): le plateau observé
+        position (int): la longueur de l'historique lors de la dernière lecture
+        valid (int): la longueur du début de l'historique lu qui n'a pas été annulé depuis
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.position = len(board.history)
+        self.valid = self.position
+
+    @property
+    def pending(self):
+        """bool: renvoie si des modifications n'ont pas encore été lues"""
+        return self.valid != self.position or self.position != len(self.board.history)
+
+    def changes(self):
+        """
+        Lit les modifications faites depuis la dernière lecture
+
+        Returns:
+            tuple: (undo_count, actions) où undo_count est le nombre d'actions lues à annuler (les plus récentes
+                   d'abord) et actions la liste des nouvelles actions à effectuer ensuite, dans l'ordre
+        """
+        history = self.board.history
+        undo_count = self.position - self.valid
+        actions = history[self.valid:]
+        self.position = self.valid = len(history)
+        return undo_count, actions
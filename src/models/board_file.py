@@ -0,0 +1,130 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import functools
+import os
+from src.const import BOARD_FILE_CACHE_SIZE, BOARD_FILE_MAX_LINE_LENGTH, BOARD_MAX_SIZE
+from src.models.exceptions import InvalidFormatError, InvalidPositionError
+from src.models.pos2d import Pos2D
+
+# Lecture et validation des fichiers de plateau:
+#   <taille>
+#   <positions des reines noires>
+#   <positions des reines blanches>
+#   <positions des flèches> (ligne facultative)
+# Les lignes sont lues une à une (et de longueur bornée) et les derniers résultats sont gardés en cache.
+
+
+def extract_positions(line):
+    """
+    Récupère la liste de positions dans line
+
+    Args:
+        line (str): string sous la forme '<pos1>,<pos2>,<pos3>,...,<posn>'
+
+    Returns:
+        list: liste de positions (str)
+
+    Raises:
+        InvalidFormatError: si la ligne est vide
+    """
+    if line.strip() == '':
+        raise InvalidFormatError('Liste de positions vide')
+    else:
+        return line.strip().split(',')
+
+
+def _read_line(f):
+    # lit une ligne, sans jamais lire plus de BOARD_FILE_MAX_LINE_LENGTH caractères
+    line = f.readline(BOARD_FILE_MAX_LINE_LENGTH + 1)
+    if len(line) > BOARD_FILE_MAX_LINE_LENGTH:
+        raise InvalidFormatError(f'Ligne de plus de {BOARD_FILE_MAX_LINE_LENGTH} caractères')
+    return line
+
+
+def _check_positions(positions, size, occupied):
+    # vérifie la syntaxe et les bornes de chaque position, et qu'aucune case n'est utilisée deux fois
+    for position in positions:
+        pos = Pos2D.from_string(position)
+        if not (0 <= pos.row < size and 0 <= pos.col < size):
+            raise InvalidPositionError(f'{position} est en dehors du plateau de taille {size}')
+        if (pos.row, pos.col) in occupied:
+            raise InvalidPositionError(f'La case {position} est utilisée plusieurs fois')
+        occupied.add((pos.row, pos.col))
+
+
+def parse_board_file(path):
+    """
+    Lit et valide un fichier de plateau
+
+    Args:
+        path (str): chemin vers un fichier de format de plateau
+
+    Returns:
+        tuple: (size, pos_black, pos_white, pos_arrows), c.f. Board
+
+    Raises:
+        OSError: si le fichier ne peut pas être lu
+        InvalidFormatError: si le format du fichier est invalide
+        InvalidPositionError: si une position est invalide, en dehors du plateau ou utilisée plusieurs fois
+    """
+    with open(path, 'r') as f:
+        try:
+            size = int(_read_line(f).strip())
+        except ValueError:  # Si la première ligne n'est pas un entier
+            raise InvalidFormatError('La taille du plateau n\'est pas donnée')
+        if not 1 <= size <= BOARD_MAX_SIZE:
+            raise InvalidFormatError(f'La taille du plateau doit être entre 1 et {BOARD_MAX_SIZE}')
+        pos_black = extract_positions(_read_line(f))
+        pos_white = extract_positions(_read_line(f))
+        # on récupère la liste des positions des flèches
+        try:
+            pos_arrows = extract_positions(_read_line(f))
+        except InvalidFormatError:
+            pos_arrows = []
+        if _read_line(f) != '':  # S'il reste du texte dans le fichier
+            raise InvalidFormatError('Format invalide: informations après les flèches')
+
+    occupied = set()
+    for positions in (pos_black, pos_white, pos_arrows):
+        _check_positions(positions, size, occupied)
+    return size, pos_black, pos_white, pos_arrows
+
+
+@functools.lru_cache(maxsize=BOARD_FILE_CACHE_SIZE)
+def _parse_cached(path, version):
+    # résultat de parse_board_file pour une version (date de modification, taille) du fichier: (résultat, None) ou
+    # (None, (type de l'erreur, message)), pour qu'une nouvelle exception soit levée à chaque appel
+    try:
+        return parse_board_file(path), None
+    except (InvalidFormatError, InvalidPositionError) as e:
+        return None, (type(e), str(e))
+
+
+def load_board_file(path):
+    """
+    Comme parse_board_file, mais le résultat (ou l'erreur) est gardé en cache tant que le fichier n'est pas modifié
+
+    Returns:
+        tuple: (size, pos_black, pos_white, pos_arrows), des copies pouvant être modifiées
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    result, error = _parse_cached(path, (stat.st_mtime_ns, stat.st_size))
+    if error is not None:
+        error_type, message = error
+        raise error_type(message)
+    size, pos_black, pos_white, pos_arrows = result
+    return size, list(pos_black), list(pos_white), list(pos_arrows)
+
+
+def is_board_file_valid(path):
+    """bool: renvoie si path est un fichier de plateau valide (c.f. load_board_file)"""
+    try:
+        load_board_file(path)
+    except (OSError, InvalidFormatError, InvalidPositionError):
+        return False
+    return True
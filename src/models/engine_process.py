@@ -0,0 +1,146 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import multiprocessing
+import threading
+import traceback
+from src.const import ENGINE_CLOSE_TIMEOUT
+from src.models.board import Board
+from src.models.exceptions import EngineError
+
+# Moteur de l'IA dans un processus séparé: la recherche ne partage pas le GIL avec l'interface graphique.
+# Protocole: des tuples (type, request_id, ...) échangés sur un Pipe
+#   interface -> moteur: (PLAY, request_id, undo_count, actions), (CLOSE, request_id)
+#   moteur -> interface: (ACTION, request_id, action), (CANCELLED, request_id, None) ou (ERROR, request_id, trace)
+# Une recherche n'est annulée qu'en arrêtant le moteur (CLOSE): un processus ne suit qu'une partie, et recommencer la
+# partie lance de nouveaux processus (c.f. AIGuiPlayer.new_for_board) plutôt que de réinitialiser les anciens. C'est
+# voulu: le plateau du moteur n'a pas à être remplacé en cours de recherche, et le lancement et le chargement du
+# nouveau moteur (c.f. warm_up) ont lieu pendant que l'adversaire joue, sans bloquer l'interface.
+
+PLAY = 'play'
+CLOSE = 'close'
+ACTION = 'action'
+CANCELLED = 'cancelled'
+ERROR = 'error'
+
+
+def _search(connection, send_lock, player, request_id):
+    # cherche l'action de player et envoie la réponse à la requête request_id
+    try:
+        action = player._play()
+    except Exception:  # erreur du moteur: sa trace est transmise à l'interface
+        response = ERROR, request_id, traceback.format_exc()
+    else:
+        # action vaut None si la recherche a été annulée avant qu'une action ne soit trouvée
+        if player.cancel_requested or action is None:
+            response = CANCELLED, request_id, None
+        else:
+            response = ACTION, request_id, action
+    with send_lock:
+        connection.send(response)
+
+
+def _serve(connection, N, snapshot, player_id, timeout):
+    # boucle du processus du moteur: les recherches ont lieu dans un thread pour que CLOSE soit reçu pendant celles-ci
+    from src.models.players import AIPlayer
+    from src.models.warmup import warm_up
+
+    warm_up.start()  # le moteur est chargé pendant que l'adversaire joue
+    board = Board.from_snapshot(N, snapshot)
+    player = AIPlayer(board, player_id, timeout=timeout)
+    send_lock = threading.Lock()
+    search = None
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:  # l'interface a été fermée
+            break
+        kind, request_id = message[:2]
+        if kind == PLAY:
+            if search is not None:
+                search.join()  # une recherche annulée doit être terminée avant de modifier le plateau
+            undo_count, actions = message[2:]
+            for _ in range(undo_count):
+                board.undo()
+            for action in actions:
+                board.act(action)
+            player.cancel_requested = False
+            search = threading.Thread(target=_search, args=(connection, send_lock, player, request_id), daemon=True)
+            search.start()
+        elif kind == CLOSE:
+            player.cancel()
+            break
+
+
+class EngineProcess:
+    """
+    Joueur artificiel (AIPlayer) exécuté dans un processus séparé, qui ne renvoie que l'action finale de chaque
+    recherche. Le processus suit le plateau à partir de son état lors de la création de EngineProcess, en recevant les
+    modifications de l'historique (c.f. BoardCursor.changes).
+
+    Attributes:
+        process (multiprocessing.Process): le processus du moteur
+        connection (multiprocessing.connection.Connection): l'extrémité du Pipe côté interface
+        request_id (int): l'identifiant de la dernière requête PLAY
+    """
+
+    def __init__(self, board, player_id, timeout=2):
+        # spawn: ne pas dupliquer (fork) un processus qui contient Qt et des threads
+        context = multiprocessing.get_context('spawn')
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_serve, name=f'engine-{player_id}', daemon=True,
+                                       args=(child_connection, board.N, board.snapshot(), player_id, timeout))
+        self.process.start()
+        child_connection.close()
+        self.request_id = 0
+        self._send_lock = threading.Lock()  # CLOSE est envoyé depuis un autre thread que PLAY
+
+    def _send(self, *message):
+        with self._send_lock:
+            try:
+                self.connection.send(message)
+            except (OSError, ValueError):  # le processus est déjà arrêté
+                pass
+
+    def play(self, undo_count, actions):
+        """
+        Envoie les modifications du plateau au moteur et attend l'action qu'il a choisie
+
+        Args:
+            undo_count (int): le nombre d'actions à annuler
+            actions (list): les nouvelles actions (Action) à effectuer ensuite
+
+        Returns:
+            Action: l'action choisie, None si la recherche a été annulée ou si le processus est arrêté
+
+        Raises:
+            EngineError: si la recherche a échoué dans le processus du moteur (le message contient la trace)
+        """
+        self.request_id += 1
+        request_id = self.request_id
+        self._send(PLAY, request_id, undo_count, actions)
+        while True:
+            try:
+                kind, response_id, action = self.connection.recv()
+            except (EOFError, OSError):
+                return None
+            if response_id == request_id:  # les réponses à des requêtes annulées sont ignorées
+                if kind == ERROR:
+                    raise EngineError(action)
+                return action if kind == ACTION else None
+
+    def close(self, timeout=ENGINE_CLOSE_TIMEOUT):
+        """
+        Annule la recherche en cours (play renvoie None en quelques millisecondes) et arrête le processus
+
+        Args:
+            timeout (float): les secondes laissées au processus pour s'arrêter avant qu'il ne soit tué
+        """
+        self._send(CLOSE, self.request_id)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
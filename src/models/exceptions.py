@@ -15,3 +15,7 @@ class InvalidPositionError(Exception):
 class InvalidActionError(Exception):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+
+class EngineError(Exception):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,393 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import random
+import numpy as np
+from src.const import *
+from src.models.action import Action
+from src.models.board import EndOfGameStatus
+from src.models.pos2d import Pos2D
+from src.models import numpy_moves
+from src.models.numba_aot.engine import load_engine
+
+# binaires pré-compilés s'ils sont à jour, sinon compilation à la volée (c.f. engine.load_engine)
+fast_board = load_engine()
+
+
+class FastBoard:
+    """Classe représentant le plateau de jeu plus rapide que Board"""
+    DIRECTIONS = np.array([(i, j) for i in range(-1, 2, 1) for j in range(-1, 2, 1) if not 0 == i == j], dtype=np.int8)
+
+    def __init__(self, board, player):
+        self.N = board.N
+        self.num_tiles = self.N ** 2
+
+        self.history = []
+
+        self.grid = np.array(board.grid.grid, dtype=np.int8)
+        self.queens = [list(map(tuple, np.argwhere(self.grid == q))) for q in (PLAYER_1, PLAYER_2)]
+        self.empty_cells = self.grid == EMPTY
+
+        self.player = player
+        self.other_player = PLAYER_1 if player == PLAYER_2 else PLAYER_2
+
+        # clé de Zobrist de la position: chaque (case, valeur) a un nombre aléatoire et la clé est le xor des nombres
+        # de toutes les cases. Elle est mise à jour en O(1) à chaque case modifiée et sert de marque aux caches.
+        zobrist_random = random.Random(ZOBRIST_SEED)
+        self._zobrist = [[[zobrist_random.getrandbits(63) for _ in range(self.N)] for _ in range(self.N)]
+                         for _ in range(len(CHARS))]
+        self.key = 0
+        for i in range(self.N):
+            for j in range(self.N):
+                self.key ^= self._zobrist[self.grid[i, j]][i][j]
+
+        # caches propres à l'instance: clé des arguments -> (clé de la position, résultat)
+        # une entrée calculée pour une autre position est simplement ignorée, il n'y a rien à vider: chaque clé des
+        # arguments n'a qu'une entrée (la dernière position calculée), la taille des caches est bornée par le plateau
+        self._possible_moves_cache = {}
+        self._possible_actions_cache = {}
+        self._has_moves_cache = {}
+
+        # cache des mouvements de la fonction pré-compilée, chaque case est marquée de la clé de sa position
+        self.moves_cache = np.full((self.N, self.N, self.num_tiles, 2), -1, dtype=np.int8)
+        self.moves_cache_stamps = np.full((self.N, self.N), -1, dtype=np.int64)
+
+        # tableaux de travail de la fonction économique, réutilisés à chaque évaluation
+        self._eval_coefs = np.zeros(4, dtype=np.int64)
+        self._eval_components = np.zeros(4, dtype=np.int64)
+        self._eval_reachability = np.zeros((2, self.N, self.N), dtype=np.int8)
+        self._eval_queue = np.empty((self.num_tiles, 2), dtype=np.int8)
+
+    @staticmethod
+    def engine_description():
+        """str: décrit le moteur utilisé par ce plateau"""
+        return fast_board.describe()
+
+    def _set(self, pos, value):
+        # modifie une case du plateau en mettant à jour la clé de la position
+        i, j = pos
+        self.key ^= self._zobrist[self.grid[i, j]][i][j] ^ self._zobrist[value][i][j]
+        self.grid[i, j] = value
+
+    def is_current_player_turn(self):
+        """bool: renovie si c'est au joueur actuel de joueur"""
+        if self.history:
+            return self.history[-1][-1] == self.other_player  # si il y a déjà eu des tours
+        return self.player == PLAYER_1  # si aucun tour n'a été joué, le premier joueur sera le joueur 1
+
+    @property
+    def status(self):
+        """EndOfGameStatus: renvoie l'état du jeu"""
+        scores = []
+        for p in (PLAYER_1, PLAYER_2):
+            scores.append(self.has_moves(p))
+        if all(scores):
+            return EndOfGameStatus()
+        else:
+            return EndOfGameStatus(*map(int, scores))
+
+    def heuristics_linear_comb(self, mobility_coef=2, terr_coef=8, reach_coef=8, relative_terr_coef=2):
+        """
+        int: Renvoie la combinaison linéaire des heuristiques
+
+        Les heuristiques (c.f. mobility et territory_reachability) sont calculées en une seule passe par une
+        fonction pré-compilée avec Numba
+        """
+        self._eval_coefs[:] = mobility_coef, terr_coef, reach_coef, relative_terr_coef
+        return fast_board.evaluate(self.DIRECTIONS,
+                                   self.N,
+                                   self.grid,
+                                   self.player,
+                                   self.is_current_player_turn(),
+                                   self._eval_coefs,
+                                   self._eval_reachability,
+                                   self._eval_queue,
+                                   self._eval_components)
+
+    def heuristics(self):
+        """tuple: Renvoie les heuristiques (mobilité, territoire, portée, territoire relatif) du plateau"""
+        self.heuristics_linear_comb()
+        return tuple(int(component) for component in self._eval_components)
+
+    @staticmethod
+    def seq_action_to_action(seq_action, player):
+        """
+        action_seq: convertit la séquence sous forme ((from_y, from_x), (to_y, to_x), (arr_y, arr_x)) en Action
+        player: int: l'id du joueur actuel
+
+        return: Action
+        """
+        from_pos = Pos2D(*seq_action[0])
+        to_pos = Pos2D(*seq_action[1])
+        arr_pos = Pos2D(*seq_action[2])
+        action = Action(from_pos, to_pos, arr_pos, player)
+        return action
+
+    def act(self, from_pos, to_pos, arr_pos, player):
+        """
+        Effectue l'action donnée
+        from_pos: séquence de taille 2
+        to_pos: séquence de taille 2
+        arr_pos: séquence de taille 2
+        player: int: l'id du joueur
+        """
+        self.history.append((from_pos, to_pos, arr_pos, player))
+
+        self._set(from_pos, EMPTY)
+        self._set(to_pos, player)
+        self._set(arr_pos, ARROW)  # après from_pos si jamais arr_pos == from_pos
+
+        # refresh empty cells
+        self.empty_cells[from_pos] = True  # mettre from_pos avant arr_pos si jamais arr_pos == from_pos
+        self.empty_cells[arr_pos] = False
+        self.empty_cells[to_pos] = False
+
+        # refresh queens positions
+        self.queens[player][self.queens[player].index(tuple(from_pos))] = to_pos
+
+    def act_action(self, action):
+        """Effectue l'Action action"""
+        from_pos = action.old_pos.y, action.old_pos.x
+        to_pos = action.new_pos.y, action.new_pos.x
+        arr_pos = action.arrow_pos.y, action.arrow_pos.x
+        self.act(from_pos, to_pos, arr_pos, action.player_id)
+
+    def _player_reachability(self, player):
+        # renvoie la grille représentant le nombre de mouvement que chaque joueur devrait
+        # faire afin d'atteindre chaque case
+        prev_added = np.empty((self.num_tiles, 2), dtype=np.int8)
+        prev_added_idx = len(self.queens[player])
+        prev_added[:prev_added_idx] = self.queens[player]
+        res = fast_board.reachability_grid(
+            self.grid,
+            self.N,
+            self.DIRECTIONS,
+            self.num_tiles,
+            self.empty_cells,
+            self.moves_cache,
+            self.moves_cache_stamps,
+            self.key,
+            prev_added,
+            prev_added_idx
+        )
+        return res
+
+    def queen_move_masks(self, player):
+        """
+        Renvoie (masks, counts): les cases atteignables (Q, N, N) et le nombre de mouvements (Q,) de chaque reine de
+        player, calculés pour toutes les reines à la fois (c.f. numpy_moves.queen_moves)
+        """
+        return numpy_moves.queen_moves(self.grid, player)
+
+    def mobility(self):
+        """return: int: le nombre total de mouvements que le joueur peut faire (pas actions!)"""
+        this_counts = self.queen_move_masks(self.player)[1]
+        other_counts = self.queen_move_masks(self.other_player)[1]
+        return int(this_counts.sum() - other_counts.sum())
+
+    def territory_reachability(self):
+        """
+        Renvoie la différence entre le nombre de cases qui appartiennent à chaque joueur ainsi que la différence
+        entre les cases atteignables.
+        Le territoire d'un joueur est défini comme suit:
+            Une case appartient à un joueur si il peut atteindre cette case en moins de mouvements
+            (sans considérer la phase du tir des flèches), que l'autre joueur.
+        Les cases atteignables sont définis tel que une cases atteignable est une cases qu'un joueur peut atteindre
+        return: (int, int)
+        """
+        this_reachability = self._player_reachability(self.player)
+        other_reachability = self._player_reachability(self.other_player)
+
+        # si m[i, j] > 0, m[i, j] appartient au joueur actuel, si m[i, j] = 0, aucun, sinon l'autre joueur
+
+        is_curr_player_turn = self.is_current_player_turn()
+        territory_grid = fast_board.whos_territory(this_reachability, other_reachability)
+
+        if not is_curr_player_turn:
+            territory_grid[territory_grid == 1] = -1
+
+        territory = np.sum(territory_grid) // 4
+        reachability = np.count_nonzero(this_reachability) - np.count_nonzero(other_reachability)
+        relative_territory = np.sum(fast_board.whos_relative_territory(this_reachability, other_reachability))
+
+        return territory, reachability, relative_territory
+
+    def last_moved_queen_influence(self):
+        """
+        Renvoie le nombre de mouvements possibles de la dernière reine déplacée
+        """
+        try:
+            queen = self.history[-1][0]
+        except IndexError:
+            return 0
+        else:
+            possible_moves = fast_board.possible_moves(self.DIRECTIONS,
+                                                       self.N,
+                                                       self.num_tiles,
+                                                       self.empty_cells,
+                                                       np.array(queen, dtype=np.int8),
+                                                       self.moves_cache,
+                                                       self.moves_cache_stamps,
+                                                       self.key,
+                                                       False
+                                                       )
+            return len(possible_moves)
+
+    def possible_actions_array(self, player):
+        """Renvoie toutes les actions possibles pour un joueur sous forme de tableau numpy de forme (n, 3, 2)"""
+        return fast_board.possible_actions(self.DIRECTIONS,
+                                           self.N,
+                                           self.num_tiles,
+                                           self.empty_cells,
+                                           np.array(self.queens[player], dtype=np.int8),
+                                           self.moves_cache,
+                                           self.moves_cache_stamps,
+                                           self.key,
+                                           False)
+
+    def random_playouts(self, player, count, seed, max_plies=0):
+        """
+        Joue count parties aléatoires depuis la position actuelle où c'est au tour de player
+
+        Args:
+            player (int): le joueur qui doit jouer
+            count (int): le nombre de parties
+            seed (int): la graine du générateur aléatoire
+            max_plies (int): le nombre d'actions avant d'évaluer le territoire (0: jusqu'à la fin de la partie)
+
+        Returns:
+            int: le nombre de parties gagnées par player
+        """
+        return fast_board.random_playouts(self.DIRECTIONS, self.N, self.grid, player, count, seed, max_plies)
+
+    def first_move_statistics(self, player, count, seed, max_plies=0):
+        """
+        Joue count parties aléatoires réparties équitablement entre toutes les actions possibles de player
+
+        Args:
+            player (int): le joueur qui doit jouer
+            count (int): le nombre total de parties
+            seed (int): la graine du générateur aléatoire
+            max_plies (int): le nombre d'actions avant d'évaluer le territoire (0: jusqu'à la fin de la partie)
+
+        Returns:
+            tuple: (actions, stats) où actions est le tableau (n, 3, 2) des actions possibles et stats le tableau
+                   (n, 2) du nombre de parties et de victoires de player pour chacune de ces actions
+        """
+        actions = self.possible_actions_array(player)
+        stats = fast_board.first_move_playouts(self.DIRECTIONS, self.N, self.grid, player, actions, count, seed,
+                                               max_plies)
+        return actions, stats
+
+    def mobility_evaluation(self):
+        """Renvoie la différence entre le nombre d'actions possibles des reines"""
+        return len(self.possible_actions(self.player)) - len(self.possible_actions(self.other_player))
+
+    def undo(self):
+        """Annule la dernière action effectuée"""
+        from_pos, to_pos, arr_pos, player = self.history.pop()
+
+        # supprimer la flèche avant de replacer la reine si la flèche est à la position de départ de la reine
+        self._set(arr_pos, EMPTY)
+        self._set(to_pos, EMPTY)
+        self._set(from_pos, player)
+
+        self.empty_cells[arr_pos] = True
+        self.empty_cells[to_pos] = True
+        self.empty_cells[from_pos] = False
+
+        self.queens[player][self.queens[player].index(to_pos)] = from_pos
+
+    def has_moves(self, player):
+        """Fonction booléenne qui renvoie si le joueur player peut joueur"""
+        cached = self._has_moves_cache.get(player)
+        if cached is not None and cached[0] == self.key:
+            return cached[1]
+        res = len(self.possible_actions(player, return_first_found=True)) > 0
+        self._has_moves_cache[player] = (self.key, res)
+        return res
+
+    def __repr__(self):
+        res = ''
+        for col in self.grid[::-1]:
+            for cell in col:
+                res += CHARS[cell] + ' '
+            res += '\n'
+        return res
+
+    def possible_moves_numba(self, from_pos, ignore_pos=None, return_first_found=False):
+        """Renvoie les mouvements possibles à partir de from_pos"""
+        cache_key = (from_pos, ignore_pos, return_first_found)
+        cached = self._possible_moves_cache.get(cache_key)
+        if cached is not None and cached[0] == self.key:
+            return cached[1]
+
+        if ignore_pos:
+            ignore_pos_np = np.array(ignore_pos, dtype=np.int8)
+            res = fast_board.possible_moves_ignore_pos(self.DIRECTIONS,
+                                            self.N,
+                                            self.num_tiles,
+                                            self.empty_cells,
+                                            np.array(from_pos, dtype=np.int8),
+                                            ignore_pos_np,
+                                            return_first_found)
+        else:
+            res = fast_board.possible_moves(self.DIRECTIONS,
+                                             self.N,
+                                             self.num_tiles,
+                                             self.empty_cells,
+                                             np.array(from_pos, dtype=np.int8),
+                                             self.moves_cache,
+                                             self.moves_cache_stamps,
+                                             self.key,
+                                             return_first_found)
+        res = tuple(map(tuple, res))
+        self._possible_moves_cache[cache_key] = (self.key, res)
+        return res
+
+    def iter_actions(self, player, queens=None):
+        """
+        Génère une à une les actions possibles pour un joueur.
+        Les flèches d'un mouvement de reine ne sont calculées qu'une fois que ce mouvement est atteint.
+
+        player: int: l'id du joueur
+        queens: liste des reines dans l'ordre dans lequel leurs actions doivent être générées (None: self.queens)
+
+        return: generator de (queen, queen_move, arr_move)
+        """
+        for queen in list(self.queens[player] if queens is None else queens):
+            for queen_move in self.possible_moves_numba(queen):
+                for arr_move in self.possible_moves_numba(queen_move, ignore_pos=queen):
+                    yield queen, queen_move, arr_move
+
+    def is_legal_action(self, action, player):
+        """bool: renvoie si l'action (from, to, arrow) peut être jouée par player"""
+        from_pos, to_pos, arr_pos = action
+        return self.grid[from_pos] == player \
+            and to_pos in self.possible_moves_numba(from_pos) \
+            and arr_pos in self.possible_moves_numba(to_pos, ignore_pos=from_pos)
+
+    def possible_actions(self, player, return_first_found=False):
+        """Renvoie toutes les actions possibles pour un joueur sous forme de liste"""
+        cache_key = (player, return_first_found)
+        cached = self._possible_actions_cache.get(cache_key)
+        if cached is not None and cached[0] == self.key:
+            return cached[1]
+        res = self._possible_actions(player, return_first_found)
+        self._possible_actions_cache[cache_key] = (self.key, res)
+        return res
+
+    def _possible_actions(self, player, return_first_found):
+        actions = []
+        for queen in self.queens[player]:
+            for queen_move in self.possible_moves_numba(queen):
+                for arr_move in self.possible_moves_numba(queen_move, ignore_pos=queen,
+                                                          return_first_found=return_first_found):
+                    res = (queen, queen_move, arr_move)
+                    if return_first_found:
+                        return res
+                    actions.append(res)
+        return actions
@@ -0,0 +1,113 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import importlib.util
+from src.const import EMPTY
+from src.models.pos2d import Pos2D
+
+# numpy n'est importé qu'au calcul des masques: sans numpy, ils sont calculés case par case avec Board
+
+
+def pack(mask):
+    """int: renvoie le masque de cases (N, N) sous forme d'entier dont le bit i*N+j représente la case (i, j)"""
+    import numpy as np
+    return int.from_bytes(np.packbits(mask.ravel(), bitorder='little').tobytes(), 'little')
+
+
+class LegalMoves:
+    """
+    Toutes les actions légales d'un joueur, calculées une seule fois au début de son tour (sans modifier le plateau):
+    chaque question de l'interface devient une recherche dans un dictionnaire de masques (c.f. pack)
+
+    Attributes:
+        N (int): dimension du plateau
+        moves (dict): (ligne, colonne) d'une reine -> masque de ses destinations
+        arrows (dict): ((ligne, colonne) de départ, (ligne, colonne) d'arrivée) -> masque des cases où la reine peut
+                       ensuite tirer sa flèche
+    """
+
+    def __init__(self, N, moves, arrows):
+        self.N = N
+        self.moves = moves
+        self.arrows = arrows
+
+    @staticmethod
+    def of_board(board, player_id):
+        """
+        LegalMoves: calcule les actions légales de player_id sur board (Board), avec numpy_moves si numpy est
+        disponible et sinon avec Board
+        """
+        if importlib.util.find_spec('numpy') is None:
+            return LegalMoves._of_board_python(board, player_id)
+        return LegalMoves._of_board_numpy(board, player_id)
+
+    @staticmethod
+    def _of_board_numpy(board, player_id):
+        import numpy as np
+        from src.models import numpy_moves
+
+        grid = np.array(board.grid.grid, dtype=np.int8)
+        N = board.size
+        positions, valid = numpy_moves.queen_positions(grid[None], player_id)
+        masks, counts = numpy_moves.queen_moves(grid, player_id)
+
+        moves = {}
+        arrows = {}
+        for (i, j), destinations in zip(positions[0][valid[0]], masks):
+            origin = int(i), int(j)
+            moves[origin] = pack(destinations)
+            rows, cols = np.nonzero(destinations)
+            if len(rows) == 0:
+                continue
+            # la flèche est tirée depuis chaque destination, la case de départ de la reine étant libérée
+            empty = grid == EMPTY
+            empty[origin] = True
+            sources = np.zeros((len(rows), N, N), dtype=bool)
+            sources[np.arange(len(rows)), rows, cols] = True
+            for row, col, arrow_mask in zip(rows, cols, numpy_moves.slide(empty, sources)):
+                arrows[origin, (int(row), int(col))] = pack(arrow_mask)
+        return LegalMoves(N, moves, arrows)
+
+    @staticmethod
+    def _of_board_python(board, player_id):
+        N = board.size
+        moves = {}
+        arrows = {}
+        for queen in board.queens[player_id]:
+            origin = queen.row, queen.col
+            destinations = 0
+            for new_pos in board._possible_moves_from(queen):
+                destinations |= 1 << (new_pos.row * N + new_pos.col)
+                # la case de départ de la reine est libérée pour la flèche
+                arrow_mask = 0
+                for arrow_pos in board._possible_moves_from(new_pos, queen):
+                    arrow_mask |= 1 << (arrow_pos.row * N + arrow_pos.col)
+                arrows[origin, (new_pos.row, new_pos.col)] = arrow_mask
+            moves[origin] = destinations
+        return LegalMoves(N, moves, arrows)
+
+    def _cells(self, mask):
+        # énumère les cases (Pos2D) d'un masque
+        N = self.N
+        while mask:
+            low_bit = mask & -mask
+            yield Pos2D(*divmod(low_bit.bit_length() - 1, N))
+            mask ^= low_bit
+
+    def destinations(self, queen):
+        """list: renvoie les destinations (Pos2D) de la reine en queen (Pos2D)"""
+        return list(self._cells(self.moves.get((queen.row, queen.col), 0)))
+
+    def arrow_destinations(self, old_pos, new_pos):
+        """list: renvoie les cases (Pos2D) où tirer une flèche après avoir déplacé la reine de old_pos à new_pos"""
+        return list(self._cells(self.arrows.get(((old_pos.row, old_pos.col), (new_pos.row, new_pos.col)), 0)))
+
+    def is_legal(self, old_pos, new_pos, arrow_pos):
+        """bool: renvoie si l'action (old_pos, new_pos, arrow_pos) (Pos2D) est légale"""
+        if not (0 <= arrow_pos.row < self.N and 0 <= arrow_pos.col < self.N):
+            return False
+        mask = self.arrows.get(((old_pos.row, old_pos.col), (new_pos.row, new_pos.col)), 0)
+        return bool(mask >> (arrow_pos.row * self.N + arrow_pos.col) & 1)
@@ -0,0 +1,101 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import numpy as np
+
+
+class MCTSTree:
+    """
+    Arbre de recherche de MCTS stocké dans des tableaux numpy.
+    Le noeud i est décrit par la ième case de chaque tableau et les enfants d'un noeud sont contigus.
+
+    Attributes:
+        size (int): le nombre de noeuds de l'arbre
+        parent (np.ndarray): l'indice du parent de chaque noeud
+        first_child (np.ndarray): l'indice du premier enfant de chaque noeud (-1 si le noeud n'est pas développé)
+        num_children (np.ndarray): le nombre d'enfants de chaque noeud
+        visits (np.ndarray): le nombre de parties jouées depuis chaque noeud
+        wins (np.ndarray): le nombre de parties gagnées par le joueur qui a joué l'action du noeud
+        actions (np.ndarray): l'action (from, to, arrow) de chaque noeud
+    """
+    ROOT = 0
+
+    def __init__(self, capacity=4096):
+        self.size = 1  # la racine
+        self.parent = np.full(capacity, -1, dtype=np.int32)
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.num_children = np.zeros(capacity, dtype=np.int32)
+        self.visits = np.zeros(capacity, dtype=np.float64)
+        self.wins = np.zeros(capacity, dtype=np.float64)
+        self.actions = np.zeros((capacity, 3, 2), dtype=np.int8)
+
+    @property
+    def capacity(self):
+        """int: le nombre de noeuds que l'arbre peut contenir sans agrandir ses tableaux"""
+        return self.parent.shape[0]
+
+    def _grow(self, min_capacity):
+        # double la capacité des tableaux jusqu'à pouvoir contenir min_capacity noeuds
+        capacity = self.capacity
+        while capacity < min_capacity:
+            capacity *= 2
+        for name, fill in (('parent', -1), ('first_child', -1), ('num_children', 0), ('visits', 0), ('wins', 0),
+                           ('actions', 0)):
+            old = getattr(self, name)
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def is_expanded(self, node):
+        """bool: renvoie si les enfants du noeud ont déjà été créés"""
+        return self.first_child[node] != -1
+
+    def expand(self, node, actions):
+        """Crée les enfants du noeud node à partir du tableau d'actions (dans un ordre aléatoire)"""
+        start = self.size
+        end = start + actions.shape[0]
+        if end > self.capacity:
+            self._grow(end)
+
+        self.first_child[node] = start
+        self.num_children[node] = actions.shape[0]
+        self.parent[start:end] = node
+        self.actions[start:end] = actions[np.random.permutation(actions.shape[0])]
+        self.size = end
+
+    def select_child(self, node, exploration):
+        """Renvoie l'enfant de node qui maximise UCT (un enfant jamais visité est choisi en priorité)"""
+        start = self.first_child[node]
+        end = start + self.num_children[node]
+        visits = self.visits[start:end]
+
+        unvisited = np.flatnonzero(visits == 0)
+        if unvisited.size:
+            return start + unvisited[0]
+
+        uct = self.wins[start:end] / visits + exploration * np.sqrt(np.log(self.visits[node]) / visits)
+        return start + int(np.argmax(uct))
+
+    def backpropagate(self, path, wins, count):
+        """
+        Ajoute count parties à chaque noeud de path (de la racine à la feuille)
+        wins est le nombre de victoires du joueur qui a joué l'action du dernier noeud de path
+        """
+        for node in reversed(path):
+            self.visits[node] += count
+            self.wins[node] += wins
+            wins = count - wins  # le noeud parent est du point de vue de l'autre joueur
+
+    def most_visited_child(self, node):
+        """Renvoie l'enfant de node le plus visité (None si node n'a pas d'enfant)"""
+        if not self.num_children[node]:
+            return None
+        start = self.first_child[node]
+        return start + int(np.argmax(self.visits[start:start + self.num_children[node]]))
+
+    def action(self, node):
+        """Renvoie l'action du noeud node sous forme ((from_y, from_x), (to_y, to_x), (arr_y, arr_x))"""
+        return tuple(map(tuple, self.actions[node].tolist()))
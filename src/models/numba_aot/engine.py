@@ -0,0 +1,137 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import hashlib
+import importlib
+import os
+from contextlib import contextmanager
+from os.path import dirname, exists, expanduser, join
+
+# ce module ne dépend pas de src: il est copié tel quel dans tournoi_numba_aot lors de la préparation du tournoi
+# (c.f. README), et y charge alors les binaires et le fast_board_aot_compiler de ce dossier
+
+AOT = 'aot'  # binaires pré-compilés par fast_board_aot_compiler
+JIT = 'jit'  # fonctions compilées à la volée par numba puis mises en cache
+
+AOT_MODULE = 'fast_board'
+COMPILER_MODULE = 'fast_board_aot_compiler'
+
+
+def source_hash(path):
+    """int: renvoie l'empreinte (60 bits) du fichier source path, indépendante des fins de ligne"""
+    with open(path, 'rb') as f:
+        source = f.read().replace(b'\r\n', b'\n')
+    return int(hashlib.sha1(source).hexdigest()[:15], 16)
+
+
+def user_cache_dir():
+    """str: renvoie le dossier de l'utilisateur dans lequel numba met en cache les fonctions compilées"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA') or expanduser(join('~', '.cache'))
+    return join(base, 'amazons', 'numba')
+
+
+@contextmanager
+def file_lock(path):
+    """Verrou exclusif entre processus sur le fichier path (bloquant)"""
+    with open(path, 'a+b') as f:
+        try:
+            import fcntl
+        except ImportError:  # Windows
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class Engine:
+    """
+    Fonctions de fast_board_aot_compiler, accessibles par leur nom d'export (ex: engine.possible_moves)
+
+    Attributes:
+        backend (str): AOT ou JIT
+        reason (str): la raison pour laquelle les binaires pré-compilés ne sont pas utilisés (None si AOT)
+        cache_dir (str): le dossier du cache de numba (None si AOT)
+    """
+
+    def __init__(self, functions, backend, reason=None, cache_dir=None):
+        self.__dict__.update(functions)
+        self.backend = backend
+        self.reason = reason
+        self.cache_dir = cache_dir
+
+    def describe(self):
+        """str: décrit le backend utilisé"""
+        if self.backend == AOT:
+            return "binaires pré-compilés (AOT)"
+        return f"compilation à la volée (JIT, cache: {self.cache_dir}): {self.reason}"
+
+
+def _compiler_path():
+    return join(dirname(__file__), COMPILER_MODULE + '.py')
+
+
+def _load_aot():
+    # renvoie le module pré-compilé ou lève ImportError si il est absent, incompatible ou périmé
+    module = importlib.import_module(f'{__package__}.{AOT_MODULE}')
+    if exists(_compiler_path()):  # sans les sources, les binaires sont forcément les bons
+        try:
+            version = module.engine_version()
+        except AttributeError:
+            raise ImportError("binaires sans version")
+        if version != source_hash(_compiler_path()):
+            raise ImportError("binaires compilés depuis une autre version de " + COMPILER_MODULE)
+    return module
+
+
+def configure_cache():
+    """
+    str: utilise le dossier de l'utilisateur (ou $NUMBA_CACHE_DIR) comme cache des fonctions compilées avec
+    cache=True et le renvoie
+    """
+    # NUMBA_CACHE_DIR doit être défini avant l'import de numba, config.CACHE_DIR couvre le cas où il l'est déjà
+    cache_dir = os.environ.setdefault('NUMBA_CACHE_DIR', user_cache_dir())
+    os.makedirs(cache_dir, exist_ok=True)
+    from numba import config
+    config.CACHE_DIR = cache_dir
+    return cache_dir
+
+
+def _load_jit():
+    # compile (ou charge depuis le cache) toutes les fonctions exportées avec leur signature AOT
+    cache_dir = configure_cache()
+    from numba import njit
+
+    compiler = importlib.import_module(f'{__package__}.{COMPILER_MODULE}')
+    # un seul processus compile, les autres attendent puis chargent le cache
+    with file_lock(join(cache_dir, COMPILER_MODULE + '.lock')):
+        functions = {name: njit(signature, cache=True)(function)
+                     for name, (function, signature) in compiler.exported_functions().items()}
+    return functions, cache_dir
+
+
+def load_engine():
+    """
+    Engine: renvoie les binaires pré-compilés s'ils correspondent à la version de python et aux sources de
+    fast_board_aot_compiler, sinon les mêmes fonctions compilées à la volée avec un cache propre à l'utilisateur.
+    Aucune compilation AOT n'a lieu ici (c.f. fast_board_aot_compiler pour compiler les binaires).
+    """
+    try:
+        module = _load_aot()
+    except ImportError as e:
+        functions, cache_dir = _load_jit()
+        return Engine(functions, JIT, reason=str(e), cache_dir=cache_dir)
+    functions = {name: value for name, value in vars(module).items() if not name.startswith('_')}
+    return Engine(functions, AOT)
@@ -4,16 +4,34 @@ Nom:        ROMANOVA
 Matricule:  521935
 """
 
+import hashlib
 import numpy as np
 from numba.pycc import CC
 from numba import njit
 
 cc = CC("fast_board")
 
+# empreinte de ce fichier, compilée dans les binaires pour que engine.load_engine détecte des binaires périmés
+# (même calcul que engine.source_hash, ce module doit pouvoir être exécuté seul)
+with open(__file__, 'rb') as _source:
+    SOURCE_HASH = int(hashlib.sha1(_source.read().replace(b'\r\n', b'\n')).hexdigest()[:15], 16)
+
+# valeurs des cases (c.f. src.const), redéfinies pour que le module reste indépendant
+PLAYER_1 = 0
+PLAYER_2 = 1
+EMPTY = 2
+ARROW = 3
+
 @njit
-@cc.export('possible_moves', 'int8[:, :](int8[:, :], int8, int16, boolean[:, :], int8[:], int8[:, :, :, :], boolean)')
-def possible_moves(DIR, N, num_tiles, empty_cells, from_pos, cache, return_first_found):
-    if cache[from_pos[0], from_pos[1], 0, 0] != -1:
+@cc.export('possible_moves', 'int8[:, :](int8[:, :], int8, int16, boolean[:, :], int8[:], int8[:, :, :, :], int64[:, :], '
+                             'int64, boolean)')
+def possible_moves(DIR, N, num_tiles, empty_cells, from_pos, cache, cache_stamps, stamp, return_first_found):
+    """
+    Renvoie les cases vides atteignables depuis from_pos.
+    Le résultat est mis en cache pour la position stamp: une entrée dont la marque (cache_stamps) est différente
+    de stamp est périmée et recalculée, le cache n'a donc jamais besoin d'être vidé.
+    """
+    if cache_stamps[from_pos[0], from_pos[1]] == stamp:
         cached_res = cache[from_pos[0], from_pos[1]]
         until_idx = np.argmax(cached_res[:, 0] == -1)
         return cache[from_pos[0], from_pos[1], :until_idx]
@@ -38,6 +56,8 @@ def possible_moves(DIR, N, num_tiles, empty_cells, from_pos, cache, return_first
     final_moves = moves[:moves_idx]
     if not return_first_found:
         cache[from_pos[0], from_pos[1], :moves_idx] = final_moves
+        cache[from_pos[0], from_pos[1], moves_idx, 0] = -1  # marque la fin des mouvements
+        cache_stamps[from_pos[0], from_pos[1]] = stamp
     return final_moves
 
 
@@ -64,8 +84,8 @@ def possible_moves_ignore_pos(DIR, N, num_tiles, empty_cells, from_pos, ignore_p
 
 
 @cc.export('reachability_grid', 'int8[:, :](int8[:, :], int8, int8[:, :], int16, boolean[:, :], int8[:, :, :, :], '
-                                'int8[:, :], int16, )')
-def reachability_grid(grid, N, DIR, num_tiles, empty_cells, moves_cache, prev_added,
+                                'int64[:, :], int64, int8[:, :], int16, )')
+def reachability_grid(grid, N, DIR, num_tiles, empty_cells, moves_cache, cache_stamps, stamp, prev_added,
                                prev_added_idx):
     reachability_grid = np.zeros_like(grid, dtype=np.int8)
 
@@ -76,7 +96,7 @@ def reachability_grid(grid, N, DIR, num_tiles, empty_cells, moves_cache, prev_ad
 
     while prev_added_idx != 0:
         for from_pos in prev_added[:prev_added_idx]:
-            moves = possible_moves(DIR, N, num_tiles, empty_cells, from_pos, moves_cache, False)
+            moves = possible_moves(DIR, N, num_tiles, empty_cells, from_pos, moves_cache, cache_stamps, stamp, False)
             for pos_i, pos_j in moves:
                 if reachability_grid[pos_i, pos_j] == 0:
                     reachability_grid[pos_i, pos_j] = reachability
@@ -96,14 +116,16 @@ def reachability_grid(grid, N, DIR, num_tiles, empty_cells, moves_cache, prev_ad
                                 'boolean[:, :], '
                                 'int8[:, :], '
                                 'int8[:, :, :, :], '
+                                'int64[:, :], '
+                                'int64, '
                                 'boolean'
                                 ')'
            )
-def possible_actions_numba(DIR, N, num_tiles, empty_cells, queens, cache, return_first_found):
+def possible_actions_numba(DIR, N, num_tiles, empty_cells, queens, cache, cache_stamps, stamp, return_first_found):
     actions = np.empty((num_tiles ** 2, 3, 2), dtype=np.int8)
     actions_idx = 0
     for queen in queens:
-        for queen_move in possible_moves(DIR, N, num_tiles, empty_cells, queen, cache, False):
+        for queen_move in possible_moves(DIR, N, num_tiles, empty_cells, queen, cache, cache_stamps, stamp, False):
             for arr_move in possible_moves_ignore_pos(DIR, N, num_tiles, empty_cells, queen_move, queen,
                                                                  return_first_found):
                 actions[actions_idx, 0] = queen
@@ -116,6 +138,340 @@ def possible_actions_numba(DIR, N, num_tiles, empty_cells, queens, cache, return
     return actions[:actions_idx]
 
 
+@njit
+def territory_owner(p1_reachability, p2_reachability):
+    """
+    Renvoie 4 si la case appartient à p1, -4 si elle appartient à p2, 1 si les deux joueurs l'atteignent en autant
+    de mouvements et 0 si aucun ne peut l'atteindre. p1_reachability et p2_reachability sont le nombre de mouvements
+    nécessaires à chacun des joueurs pour atteindre la case (0: inatteignable)
+    """
+    if p1_reachability > p2_reachability > 0 or p2_reachability > p1_reachability == 0:
+        return -4
+    elif p2_reachability > p1_reachability > 0 or p1_reachability > p2_reachability == 0:
+        return 4
+    elif p1_reachability == p2_reachability > 0:
+        return 1
+    return 0
+
+
+@njit
+def relative_territory_owner(p1_reachability, p2_reachability):
+    """
+    Renvoie p2 - p1 si les deux joueurs peuvent atteindre la case, 4 si seulement p1 peut, -4 si seulement p2 peut
+    """
+    if p1_reachability == p2_reachability == 0:
+        return 0
+    elif p1_reachability > 0 and p2_reachability == 0:
+        return 4
+    elif p1_reachability == 0 and p2_reachability > 0:
+        return -4
+    return p2_reachability - p1_reachability
+
+
+@cc.export('whos_territory', 'int8[:, :](int8[:, :], int8[:, :])')
+def whos_territory(p1_reachability, p2_reachability):
+    """Applique territory_owner à chaque case des grilles de portée des deux joueurs"""
+    res = np.empty_like(p1_reachability)
+    for i in range(p1_reachability.shape[0]):
+        for j in range(p1_reachability.shape[1]):
+            res[i, j] = territory_owner(p1_reachability[i, j], p2_reachability[i, j])
+    return res
+
+
+@cc.export('whos_relative_territory', 'int8[:, :](int8[:, :], int8[:, :])')
+def whos_relative_territory(p1_reachability, p2_reachability):
+    """Applique relative_territory_owner à chaque case des grilles de portée des deux joueurs"""
+    res = np.empty_like(p1_reachability)
+    for i in range(p1_reachability.shape[0]):
+        for j in range(p1_reachability.shape[1]):
+            res[i, j] = relative_territory_owner(p1_reachability[i, j], p2_reachability[i, j])
+    return res
+
+
+@njit
+def ray_moves(DIR, N, grid, from_i, from_j, moves):
+    """
+    Écrit dans moves les cases vides atteignables depuis (from_i, from_j) et renvoie leur nombre.
+    Contrairement à possible_moves, aucun tableau n'est alloué.
+    """
+    moves_idx = 0
+    for d in DIR:
+        i = from_i + d[0]
+        j = from_j + d[1]
+        while 0 <= i < N and 0 <= j < N and grid[i, j] == EMPTY:
+            moves[moves_idx, 0] = i
+            moves[moves_idx, 1] = j
+            moves_idx += 1
+            i += d[0]
+            j += d[1]
+    return moves_idx
+
+
+@njit
+def territory_winner(DIR, N, grid, queens, num_queens, player, distances, queue):
+    """
+    Renvoie le joueur qui possède le plus de cases (atteintes en moins de mouvements que l'autre joueur)
+    En cas d'égalité, le joueur player (qui doit jouer) est désavantagé.
+    """
+    for p in range(2):
+        distances[p, :, :] = N * N
+        queue_start = 0
+        queue_end = 0
+        for q in range(num_queens[p]):
+            distances[p, queens[p, q, 0], queens[p, q, 1]] = 0
+            queue[queue_end] = queens[p, q]
+            queue_end += 1
+        while queue_start < queue_end:
+            from_i = queue[queue_start, 0]
+            from_j = queue[queue_start, 1]
+            queue_start += 1
+            dist = distances[p, from_i, from_j] + 1
+            for d in DIR:
+                i = from_i + d[0]
+                j = from_j + d[1]
+                while 0 <= i < N and 0 <= j < N and grid[i, j] == EMPTY:
+                    if distances[p, i, j] > dist:
+                        distances[p, i, j] = dist
+                        queue[queue_end, 0] = i
+                        queue[queue_end, 1] = j
+                        queue_end += 1
+                    i += d[0]
+                    j += d[1]
+    territory = 0
+    for i in range(N):
+        for j in range(N):
+            if distances[player, i, j] < distances[1 - player, i, j]:
+                territory += 1
+            elif distances[player, i, j] > distances[1 - player, i, j]:
+                territory -= 1
+    return player if territory > 0 else 1 - player
+
+
+@njit
+def random_playout(DIR, N, grid, queens, num_queens, player, max_plies, moves, distances, queue):
+    """
+    Joue des actions aléatoires sur grid à partir du tour de player et renvoie le gagnant.
+    Le premier joueur sans mouvement possible perd. Après max_plies actions (si max_plies > 0), le gagnant est
+    déterminé par le territoire.
+    """
+    ply = 0
+    while max_plies <= 0 or ply < max_plies:
+        if num_queens[player] == 0:
+            return 1 - player
+        # une reine au hasard parmi celles qui peuvent bouger
+        first_queen = np.random.randint(0, num_queens[player])
+        num_moves = 0
+        queen = 0
+        for k in range(num_queens[player]):
+            queen = (first_queen + k) % num_queens[player]
+            num_moves = ray_moves(DIR, N, grid, queens[player, queen, 0], queens[player, queen, 1], moves)
+            if num_moves > 0:
+                break
+        if num_moves == 0:
+            return 1 - player
+
+        move = np.random.randint(0, num_moves)
+        to_i = moves[move, 0]
+        to_j = moves[move, 1]
+        grid[queens[player, queen, 0], queens[player, queen, 1]] = EMPTY
+        grid[to_i, to_j] = player
+        queens[player, queen, 0] = to_i
+        queens[player, queen, 1] = to_j
+
+        # la case de départ est vide: la flèche peut y être tirée
+        num_arrows = ray_moves(DIR, N, grid, to_i, to_j, moves)
+        arrow = np.random.randint(0, num_arrows)
+        grid[moves[arrow, 0], moves[arrow, 1]] = ARROW
+
+        player = 1 - player
+        ply += 1
+    return territory_winner(DIR, N, grid, queens, num_queens, player, distances, queue)
+
+
+@njit
+def find_queens(N, grid, queens, num_queens):
+    """Écrit dans queens la position des reines de chaque joueur et dans num_queens leur nombre"""
+    num_queens[:] = 0
+    for i in range(N):
+        for j in range(N):
+            p = grid[i, j]
+            if p == PLAYER_1 or p == PLAYER_2:
+                queens[p, num_queens[p], 0] = i
+                queens[p, num_queens[p], 1] = j
+                num_queens[p] += 1
+
+
+@cc.export('random_playouts', 'int32(int8[:, :], int8, int8[:, :], int8, int32, int64, int16)')
+def random_playouts(DIR, N, grid, player, count, seed, max_plies):
+    """
+    Joue count parties aléatoires depuis grid où c'est au tour de player et renvoie le nombre de parties gagnées
+    par player. Tous les tableaux de travail sont alloués une seule fois.
+    """
+    np.random.seed(seed)
+
+    playout_grid = np.empty_like(grid)
+    initial_queens = np.empty((2, N * N, 2), dtype=np.int8)
+    num_queens = np.zeros(2, dtype=np.int64)
+    find_queens(N, grid, initial_queens, num_queens)
+
+    queens = np.empty_like(initial_queens)
+    moves = np.empty((N * N, 2), dtype=np.int8)
+    distances = np.empty((2, N, N), dtype=np.int16)
+    queue = np.empty((N * N, 2), dtype=np.int8)
+
+    wins = 0
+    for _ in range(count):
+        playout_grid[:, :] = grid
+        queens[:, :, :] = initial_queens
+        winner = random_playout(DIR, N, playout_grid, queens, num_queens, player, max_plies, moves, distances, queue)
+        if winner == player:
+            wins += 1
+    return wins
+
+
+@cc.export('first_move_playouts', 'int32[:, :](int8[:, :], int8, int8[:, :], int8, int8[:, :, :], int32, int64, '
+                                  'int16)')
+def first_move_playouts(DIR, N, grid, player, actions, count, seed, max_plies):
+    """
+    Joue count parties aléatoires depuis grid où c'est au tour de player. La première action de la partie k est
+    actions[k % len(actions)] (toutes les actions sont donc jouées autant de fois), la suite est aléatoire.
+
+    Renvoie un tableau de forme (len(actions), 2): le nombre de parties et le nombre de victoires de player pour
+    chaque première action. Tous les tableaux de travail sont alloués une seule fois.
+    """
+    np.random.seed(seed)
+
+    num_actions = actions.shape[0]
+    stats = np.zeros((num_actions, 2), dtype=np.int32)
+    if num_actions == 0:
+        return stats
+
+    playout_grid = np.empty_like(grid)
+    initial_queens = np.empty((2, N * N, 2), dtype=np.int8)
+    num_queens = np.zeros(2, dtype=np.int64)
+    queens = np.empty_like(initial_queens)
+    moves = np.empty((N * N, 2), dtype=np.int8)
+    distances = np.empty((2, N, N), dtype=np.int16)
+    queue = np.empty((N * N, 2), dtype=np.int8)
+
+    for k in range(count):
+        a = k % num_actions
+        playout_grid[:, :] = grid
+        playout_grid[actions[a, 0, 0], actions[a, 0, 1]] = EMPTY
+        playout_grid[actions[a, 1, 0], actions[a, 1, 1]] = player
+        playout_grid[actions[a, 2, 0], actions[a, 2, 1]] = ARROW
+        find_queens(N, playout_grid, queens, num_queens)
+
+        winner = random_playout(DIR, N, playout_grid, queens, num_queens, 1 - player, max_plies, moves, distances,
+                                queue)
+        stats[a, 0] += 1
+        if winner == player:
+            stats[a, 1] += 1
+    return stats
+
+
+@njit
+def evaluation_components(DIR, N, grid, player, is_player_turn, reachability, queue, components):
+    """
+    Calcule en une passe les heuristiques de la fonction économique du point de vue de player et les écrit dans
+    components: (mobilité, territoire, portée, territoire relatif) (c.f. AIPlayer)
+
+    reachability (2, N, N) et queue (N * N, 2) sont des tableaux de travail réutilisés d'un appel à l'autre.
+    """
+    mobility = 0
+    for p in range(2):
+        reachability[p, :, :] = 0
+        queue_end = 0
+        add = 1 if p == player else -1
+        # mouvements des reines: mobilité et cases atteignables en un mouvement
+        for from_i in range(N):
+            for from_j in range(N):
+                if grid[from_i, from_j] != p:
+                    continue
+                for d in DIR:
+                    i = from_i + d[0]
+                    j = from_j + d[1]
+                    while 0 <= i < N and 0 <= j < N and grid[i, j] == EMPTY:
+                        mobility += add
+                        if reachability[p, i, j] == 0:
+                            reachability[p, i, j] = 1
+                            queue[queue_end, 0] = i
+                            queue[queue_end, 1] = j
+                            queue_end += 1
+                        i += d[0]
+                        j += d[1]
+        # parcours en largeur: nombre de mouvements nécessaires pour atteindre chaque case
+        queue_start = 0
+        while queue_start < queue_end:
+            from_i = queue[queue_start, 0]
+            from_j = queue[queue_start, 1]
+            queue_start += 1
+            level = reachability[p, from_i, from_j] + 1
+            for d in DIR:
+                i = from_i + d[0]
+                j = from_j + d[1]
+                while 0 <= i < N and 0 <= j < N and grid[i, j] == EMPTY:
+                    if reachability[p, i, j] == 0:
+                        reachability[p, i, j] = level
+                        queue[queue_end, 0] = i
+                        queue[queue_end, 1] = j
+                        queue_end += 1
+                    i += d[0]
+                    j += d[1]
+
+    territory = 0
+    reach = 0
+    relative_territory = 0
+    for i in range(N):
+        for j in range(N):
+            this = reachability[player, i, j]
+            other = reachability[1 - player, i, j]
+            if this > 0:
+                reach += 1
+            if other > 0:
+                reach -= 1
+
+            if this > other > 0 or other > this == 0:
+                territory -= 4
+                relative_territory += -4 if this == 0 else other - this
+            elif other > this > 0 or this > other == 0:
+                territory += 4
+                relative_territory += 4 if other == 0 else other - this
+            elif this == other > 0:
+                # case atteinte en autant de mouvements: avantage au joueur dont c'est le tour
+                territory += 1 if is_player_turn else -1
+
+    components[0] = mobility
+    components[1] = territory // 4
+    components[2] = reach
+    components[3] = relative_territory
+
+
+@cc.export('evaluate', 'int64(int8[:, :], int8, int8[:, :], int8, boolean, int64[:], int8[:, :, :], int8[:, :], '
+                       'int64[:])')
+def evaluate(DIR, N, grid, player, is_player_turn, coefs, reachability, queue, components):
+    """
+    Renvoie la combinaison linéaire (de coefficients coefs) des heuristiques de la fonction économique du point de
+    vue de player. Les heuristiques sont écrites dans components et tous les tableaux de travail sont réutilisés.
+    """
+    evaluation_components(DIR, N, grid, player, is_player_turn, reachability, queue, components)
+    score = 0
+    for k in range(4):
+        score += coefs[k] * components[k]
+    return score
+
+
+@cc.export('engine_version', 'int64()')
+def engine_version():
+    """Renvoie l'empreinte des sources à partir desquelles les binaires ont été compilés"""
+    return SOURCE_HASH
+
+
+def exported_functions():
+    """dict: renvoie {nom d'export: (fonction python, signature)} de toutes les fonctions exportées"""
+    return {name: (entry.function, entry.signature) for name, entry in cc._exported_functions.items()}
+
+
 def compile():
     cc.compile()
 
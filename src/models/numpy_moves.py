@@ -0,0 +1,127 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import numpy as np
+from src.const import EMPTY
+
+# Génération des mouvements de toutes les reines d'un ou plusieurs plateaux à la fois, en numpy uniquement.
+# Les plateaux sont des tableaux (N, N) ou des piles (B, N, N): chaque opération traite toute la pile.
+
+DIRECTIONS = [(i, j) for i in range(-1, 2, 1) for j in range(-1, 2, 1) if not 0 == i == j]
+
+
+def _shift(a, di, dj, out):
+    # écrit dans out le tableau a décalé de (di, dj) sur ses deux derniers axes, les cases sortantes sont perdues et
+    # les cases entrantes sont fausses (out peut être a)
+    N = a.shape[-1]
+    out[..., max(di, 0):N + min(di, 0), max(dj, 0):N + min(dj, 0)] = \
+        a[..., max(-di, 0):N + min(-di, 0), max(-dj, 0):N + min(-dj, 0)]
+    if di > 0:
+        out[..., :di, :] = False
+    elif di < 0:
+        out[..., N + di:, :] = False
+    if dj > 0:
+        out[..., :, :dj] = False
+    elif dj < 0:
+        out[..., :, N + dj:] = False
+    return out
+
+
+def slide(empty, sources):
+    """
+    Renvoie les cases atteignables en un mouvement de reine depuis les cases de sources
+
+    Args:
+        empty (np.ndarray): booléens (..., N, N) des cases vides
+        sources (np.ndarray): booléens (..., N, N) des cases de départ, diffusable avec empty (ex: (B, Q, N, N) pour
+                              les reines de chaque plateau avec empty[:, None])
+
+    Returns:
+        np.ndarray: booléens de la forme de la diffusion de empty et sources
+    """
+    shape = np.broadcast_shapes(empty.shape, sources.shape)
+    reach = np.zeros(shape, dtype=bool)
+    front = np.empty(shape, dtype=bool)
+    for di, dj in DIRECTIONS:
+        # le front avance d'une case à chaque étape et s'arrête sur la première case non vide de chaque rayon
+        _shift(np.broadcast_to(sources, shape), di, dj, front)
+        front &= empty
+        while front.any():
+            reach |= front
+            _shift(front, di, dj, front)
+            front &= empty
+    return reach
+
+
+def queen_positions(grids, player):
+    """
+    Renvoie la position des reines de player sur chaque plateau de la pile grids (B, N, N)
+
+    Returns:
+        tuple: (positions, valid) où positions (B, Q, 2) contient les positions (i, j) des reines, dans l'ordre de
+               lecture du plateau, et valid (B, Q) indique les reines existantes (Q est le plus grand nombre de
+               reines d'un plateau, les positions manquantes valent -1)
+    """
+    is_queen = grids == player
+    counts = is_queen.sum(axis=(1, 2))
+    max_queens = int(counts.max()) if len(counts) else 0
+    boards, rows, cols = np.nonzero(is_queen)  # triés par plateau puis dans l'ordre de lecture
+    ranks = np.arange(len(boards)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    positions = np.full((len(grids), max_queens, 2), -1, dtype=np.int64)
+    positions[boards, ranks, 0] = rows
+    positions[boards, ranks, 1] = cols
+    valid = np.arange(max_queens) < counts[:, None]
+    return positions, valid
+
+
+def queen_moves(grids, player):
+    """
+    Calcule les mouvements de toutes les reines de player à la fois
+
+    Args:
+        grids (np.ndarray): un plateau (N, N) ou une pile de plateaux (B, N, N)
+        player (int): l'id du joueur
+
+    Returns:
+        tuple: (masks, counts) où masks (Q, N, N) (ou (B, Q, N, N)) indique les cases atteignables par chaque reine
+               (dans l'ordre de queen_positions) et counts (Q,) (ou (B, Q)) leur nombre. Les reines manquantes d'un
+               plateau de la pile n'ont aucun mouvement.
+    """
+    grids = np.asarray(grids)
+    stack = grids if grids.ndim == 3 else grids[None]
+    N = stack.shape[-1]
+
+    positions, valid = queen_positions(stack, player)
+    sources = np.zeros(positions.shape[:2] + (N, N), dtype=bool)
+    boards, queens = np.nonzero(valid)
+    sources[boards, queens, positions[boards, queens, 0], positions[boards, queens, 1]] = True
+
+    masks = slide((stack == EMPTY)[:, None], sources)
+    counts = masks.sum(axis=(2, 3))
+    if grids.ndim == 2:
+        return masks[0], counts[0]
+    return masks, counts
+
+
+def reachability(grids, player):
+    """
+    Renvoie le nombre de mouvements nécessaires aux reines de player pour atteindre chaque case (0: inatteignable),
+    pour un plateau (N, N) ou une pile de plateaux (B, N, N)
+    """
+    grids = np.asarray(grids)
+    empty = grids == EMPTY
+    levels = np.zeros(grids.shape, dtype=np.int16)
+    visited = np.zeros(grids.shape, dtype=bool)
+    front = grids == player
+    level = 0
+    while front.any():
+        level += 1
+        front = slide(empty, front)
+        front &= ~visited
+        visited |= front
+        levels[front] = level
+    return levels
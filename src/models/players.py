@@ -8,40 +8,26 @@ from abc import ABCMeta, abstractmethod
 from src.const import *
 from src.models.exceptions import *
 from src.models.action import Action
+from src.models.warmup import warm_up
+import os
 import time
-import numpy as np
-from src.models.board import EndOfGameStatus
-from src.models.pos2d import Pos2D
-from functools import lru_cache
-
-import numba
-
-try:
-    from src.models.numba_aot import fast_board
-except ImportError:
-    print("Impossible d'importer les binaires précompilés par numba...")
-    from pathlib import Path
-    if Path('src/models/numba_aot').is_dir():
-        import shutil
+import random
+
+
+def fast_board_class():
+    """
+    Renvoie la classe de plateau rapide des joueurs artificiels: FastBoard (numba) si numpy et numba sont
+    disponibles, sinon BitBoard (Python pur). AMAZONS_ENGINE=python (c.f. ENGINE_ENV_VAR) force BitBoard.
+    """
+    if os.environ.get(ENGINE_ENV_VAR) != ENGINE_PYTHON:
         try:
-            shutil.rmtree('src/models/numba_aot/__pycache__')  # pour éviter des erreurs d'import par après
-        except OSError:
+            from src.models.fast_board import FastBoard
+        except ImportError:
             pass
-        print("Probablement la version de python utilisée est différente")
-        print("Essayons de compiler... ceci va prendre ~5s et se fera qu'une seule fois")
-        try:
-            from src.models.numba_aot import fast_board_aot_compiler
-            fast_board_aot_compiler.compile()
-        except Exception as e:
-            print("Une erreur s'est produite lors de la compilation..")
-            print(e)
-            exit()
         else:
-            from src.models.numba_aot import fast_board
-            print("Compilation réussie, continuons!")
-    else:
-        print("Le dossier numba n'a pas été importé")
-        exit()
+            return FastBoard
+    from src.models.bit_board import BitBoard
+    return BitBoard
 
 
 class Player(metaclass=ABCMeta):
@@ -68,6 +54,12 @@ class Player(metaclass=ABCMeta):
         action = self._play()
         self.board.act(action)
 
+    def new_for_board(self, board):
+        """
+        Player: renvoie un nouveau joueur du même type et avec le même id pour le plateau board (c.f. Amazons.new_game)
+        """
+        return type(self)(board, self.player_id)
+
     @property
     def other_player_id(self):
         """
@@ -112,6 +104,7 @@ class GameTree:
         self.__score = score
         self.__action = action
         self.children = []
+        self.all_children_generated = False  # les enfants sont générés au fur et à mesure par minimax
 
     def __getstate__(self):
         return self.__dict__
@@ -143,7 +136,77 @@ class GameTree:
         return f"Score: {self.score}, action: {self.action}, children: {self.children}"
 
 
-class AIPlayer(Player):
+class FastBoardPlayer(Player):
+    """
+    Classe abstraite représentant un joueur artificiel qui cherche ses actions sur un FastBoard
+
+    FastBoard (et donc numpy et numba) n'est importé qu'à la création du premier joueur artificiel, une partie
+    entre humains ne charge pas ces modules. Sans numba, le plateau rapide est un BitBoard (c.f. fast_board_class).
+
+    Attributes:
+        timeout (float): le temps (en secondes) dont le joueur dispose pour chaque action
+        timer (Timer): le chronomètre de l'action en cours
+        fast_board (FastBoard): le plateau rapide, tenu à jour avec l'historique de board
+        board_cursor (BoardCursor): le curseur de fast_board sur l'historique de board
+        cancel_requested (bool): True si la recherche en cours a été annulée (c.f. cancel), remis à False par
+                                 l'appelant avant la recherche suivante
+    """
+
+    def __init__(self, board, player_id, timeout=2):
+        super().__init__(board, player_id)
+        self.timeout = timeout
+        self.timer = Timer()
+
+        self.fast_board = fast_board_class()(board, self.player_id)
+        self.board_cursor = board.cursor()
+        self.cancel_requested = False
+
+    @abstractmethod
+    def find_action(self):
+        """
+        Cherche l'action à jouer sur self.fast_board avant que self.timer ne dépasse la limite de temps
+
+        Returns:
+            tuple: (action, action_np) où action est une Action et action_np le tuple (from, to, arrow)
+        """
+        pass
+
+    def _play(self):
+        """
+        Détermine le meilleur coup à jouer
+
+        Returns:
+            Action: le meilleur coup déterminé via find_action, None si la recherche a été annulée (c.f. cancel) avant
+                    qu'une action ne soit trouvée
+        """
+        # le chargement et la compilation du moteur par le préchauffage ne sont pas comptés dans le temps de l'action
+        warm_up.wait()
+        self.timer = Timer(self.timeout)
+        if self.cancel_requested:  # annulée avant même le début de la recherche
+            self.timer.cancel()
+
+        # ~100x plus rapide de mettre le plateau à jour avec les mouvements de history que de le recopier (~10e-5 s)
+        self.update_board()
+
+        # l'action sera effectuée sur fast_board par le prochain update_board, une fois jouée sur board
+        action, action_np = self.find_action()
+        return action
+
+    def cancel(self):
+        """Annule la recherche en cours: find_action renvoie dès le prochain test du chronomètre"""
+        self.cancel_requested = True
+        self.timer.cancel()
+
+    def update_board(self):
+        """Met le fast_board à jour avec les modifications de l'historique de self.board depuis le dernier appel"""
+        undo_count, actions = self.board_cursor.changes()
+        for _ in range(undo_count):
+            self.fast_board.undo()
+        for action in actions:
+            self.fast_board.act_action(action)
+
+
+class AIPlayer(FastBoardPlayer):
     """
     Une intelligence artificielle pour le jeu des Amazones utilisant l'algorithme Minimax avec plusieurs améliorations
 
@@ -161,9 +224,37 @@ class AIPlayer(Player):
             Dans le but d'accélérer au plus la recherche, une estimation de la fonction économique doit être donnée.
             Ici, l'estimation donnée pour le premier tour est 0, sinon la fonction économique pour l'action précédente.
 
+        Le PVS (Principal Variation Search) avec fenêtres d'aspiration est une alternative au MTDF (search='pvs').
+            Seul le premier enfant (le meilleur de l'itération précédente) est évalué avec la fenêtre complète, les
+            autres avec un null window et ne sont réévalués que s'ils pourraient être meilleurs.
+            La recherche à la racine commence avec une fenêtre de ±aspiration_window autour du score précédent qui
+            est élargie lorsque le score en sort. Contrairement au MTDF, une fonction économique grossière ne
+            provoque donc pas de nombreuses recherches successives.
+
         Pour minimax, si l'arbre de jeu n'est pas vide (grâce au approfondissement itératif), les actions sont triées
             dans l'ordre décroissant pour pouvoir éliminer le plus de branches grâce au alpha-beta pruning
 
+        Génération des actions par étapes:
+            Les enfants d'un noeud ne sont générés qu'au moment où ils sont évalués. D'abord les enfants déjà
+            évalués lors de l'itération précédente (triés, le meilleur en premier), puis les killer moves (actions
+            qui ont causé une coupure au même tour), puis les actions des reines dans l'ordre de l'history
+            heuristic (reines dont la case a causé le plus de coupures), les flèches n'étant calculées que pour le
+            mouvement de reine en cours. Lorsqu'une coupure alpha-beta a lieu, les actions restantes ne sont jamais
+            générées.
+
+        Late move reductions (LMR):
+            Une fois les enfants triés, seuls les lmr_min_moves premiers sont évalués à pleine profondeur. Les
+            suivants sont d'abord évalués à une profondeur réduite de lmr_reduction avec un null window et ne sont
+            réévalués à pleine profondeur que s'ils peuvent améliorer le résultat (fail-high).
+            Elles sont désactivées par défaut (lmr_min_moves=None), leur effet sur la force du joueur n'ayant pas
+            été mesuré.
+            Le forward pruning (forward_pruning=K) est plus agressif: seuls les K meilleurs enfants sont évalués.
+
+        Prédiction du coût des itérations:
+            Le nombre de noeuds visités et le temps de chaque itération sont mesurés. Le facteur de branchement
+            effectif (noeuds de l'itération d / noeuds de l'itération d - 1) permet d'estimer la durée de l'itération
+            suivante. Si celle-ci ne peut pas se terminer dans le temps restant, elle n'est pas commencée.
+
     FONCTION ÉCONOMIQUE:
         La fonction économique est la combinaison linéaire de plusieurs heuristiques.
         Plus précisément:
@@ -191,52 +282,51 @@ class AIPlayer(Player):
 
         La fonction possible_moves et reachability_grid sont évaluées par des fonctions pré-compilées avec Numba
 
+        La fonction économique est calculée en une seule passe par une fonction pré-compilée (evaluate) qui
+            réutilise les mêmes tableaux de travail à chaque évaluation
+
         Également dans le but d'accélérer minimax, la vérification de fin de jeu prématurée ne se fait pas:
             cette vérification demande trop de ressources pour très peu... grâce à la fonction économique, l'IA a
             finalement une très bonne estimation de l'état favorable ou non de jeu.
     """
 
-    def __init__(self, board, player_id, fact=0, timeout=2):
-        super().__init__(board, player_id)
+    def __init__(self, board, player_id, fact=0, timeout=2, search=SEARCH_MTDF,
+                 aspiration_window=ASPIRATION_WINDOW_DEFAULT, lmr_min_moves=None,
+                 lmr_reduction=LMR_REDUCTION_DEFAULT, forward_pruning=None):
+        super().__init__(board, player_id, timeout)
+        if search not in SEARCHES:
+            raise ValueError(f"Algorithme de recherche inconnu: {search}. Doit être parmi {SEARCHES}")
         self.t = timeout
-        self.timeout = timeout
         self.fact = fact
-        self.timer = Timer()
-        self.fast_board = FastBoard(board, self.player_id)
 
-        self.last_score = 0  # need that for MTDF
+        self.search = search
+        self.aspiration_window = aspiration_window  # None pour une fenêtre infinie
 
-    def _play(self):
-        """
-        Détermine le meilleur coup à jouer
+        self.lmr_min_moves = lmr_min_moves  # None pour désactiver les late move reductions
+        self.lmr_reduction = lmr_reduction
+        self.forward_pruning = forward_pruning  # None pour évaluer tous les enfants
 
-        Returns:
-            Action: le meilleur coup déterminé via minimax
-        """
-        self.timer = Timer(self.timeout)
+        self.last_score = 0  # need that for MTDF and PVS
 
-        # ~100x plus rapide de mettre le plateau à jour avec les mouvements de history que de le recopier (~10e-5 s)
-        self.update_board()
+        self.nodes_count = 0  # nombre de noeuds visités par minimax
+        self.iterations_stats = []  # (profondeur, noeuds, temps) de chaque itération du dernier coup
 
-        action, action_np = self.iterative_deepening()
+        self.killers = {}  # tour de fast_board -> actions qui ont causé une coupure alpha-beta (2 au plus)
+        self.history_heuristic = {}  # case de départ d'une reine -> somme des depth² des coupures causées
 
-        self.fast_board.act(*action_np, self.player_id)
-        return action
+    def new_for_board(self, board):
+        """AIPlayer: renvoie un nouveau joueur avec les mêmes paramètres pour le plateau board"""
+        return type(self)(board, self.player_id, self.fact, self.timeout, self.search, self.aspiration_window,
+                          self.lmr_min_moves, self.lmr_reduction, self.forward_pruning)
 
-    def update_board(self):
-        """Met le fast_board à jour avec les actions dans l'historique de self.board"""
-        i = -1
-        while True:  # dans le cas où l'autre joueur a effectué plusieurs action, on fait un loop
-            try:
-                last_action = self.board.history[i]
-            except IndexError:
-                return
-            else:
-                if last_action.player_id != self.player_id:
-                    self.fast_board.act_action(last_action)
-                else:
-                    return
-            i -= 1
+    def find_action(self):
+        """
+        Détermine le meilleur coup à jouer via minimax
+
+        Returns:
+            tuple: (Action, tuple(from, to, arrow))
+        """
+        return self.iterative_deepening()
 
     def iterative_deepening(self, max_depth=10):
         """
@@ -245,18 +335,29 @@ class AIPlayer(Player):
             max_depth: int
 
         return: action, action_np
-            Action, tuple(from, to, arrow)
+            Action, tuple(from, to, arrow), ou (None, None) si la recherche a été annulée avant de trouver une action
         """
 
         root = GameTree()
         depth = 1
         action_tuple = None
+        self.iterations_stats = []
+        self.killers = {}
+        self.history_heuristic = {}
 
         while True:
-            best_child, remaining_depth = self.MTDF(root, self.last_score, depth)
+            nodes_before = self.nodes_count
+            iteration_start = self.timer.time
+
+            best_child, remaining_depth = self.search_driver(root, self.last_score, depth)
+            if best_child is None:  # le chronomètre a expiré avant le premier appel à minimax (c.f. MTDF)
+                break
             self.last_score = best_child.score
 
-            should_go_deeper = not remaining_depth and not self.timer.timeouts_soon() and depth < max_depth
+            self.iterations_stats.append((depth, self.nodes_count - nodes_before, self.timer.time - iteration_start))
+
+            should_go_deeper = not remaining_depth and not self.timer.timeouts_soon() and depth < max_depth \
+                and self.predicted_iteration_time() < self.timer.remaining
 
             if best_child.action is not None:
                 action_tuple = best_child.action
@@ -266,11 +367,68 @@ class AIPlayer(Player):
 
             depth += 1
 
+        if action_tuple is None and self.cancel_requested:  # annulée avant la fin de la première itération
+            return None, None
         assert action_tuple is not None, "No move found"
 
         action = self.fast_board.seq_action_to_action(action_tuple, self.player_id)
         return action, action_tuple
 
+    def predicted_iteration_time(self):
+        """
+        Estime la durée de la prochaine itération de l'approfondissement itératif
+
+        Le facteur de branchement effectif est le rapport entre le nombre de noeuds des deux dernières itérations.
+        La prochaine itération devrait visiter ce facteur fois plus de noeuds, au même coût par noeud.
+        Avec une seule itération, aucune estimation n'est possible et 0 est renvoyé.
+
+        return: float: le temps estimé en secondes
+        """
+        if len(self.iterations_stats) < 2:
+            return 0
+        _, prev_nodes, _ = self.iterations_stats[-2]
+        _, last_nodes, last_time = self.iterations_stats[-1]
+        branching_factor = last_nodes / max(prev_nodes, 1)
+        return last_time * branching_factor
+
+    def search_driver(self, root, f, d):
+        """Lance l'algorithme de recherche choisi (self.search) à la profondeur d"""
+        if self.search == SEARCH_PVS:
+            return self.PVS(root, f, d)
+        return self.MTDF(root, f, d)
+
+    def PVS(self, root, f, d):
+        """
+        Le Principal Variation Search avec une fenêtre d'aspiration autour de f
+
+        root: GameTree
+            la racine de l'arbre de jeu
+        f: int
+            l'approximation du score de la meilleure action
+
+        d: int:
+            la profondeur pour minimax
+        """
+        if self.aspiration_window is None:
+            return self.minimax(d, root, principal_variation=True)
+
+        window = self.aspiration_window
+        alpha, beta = f - window, f + window
+
+        while True:
+            best_node, best_node_depth = self.minimax(d, root, alpha, beta, principal_variation=True)
+            g = best_node.score
+
+            if self.timer.timeouts_soon() or alpha < g < beta:
+                return best_node, best_node_depth
+
+            # le score est sorti de la fenêtre: on l'élargit du côté où il est sorti
+            window *= 2
+            if g <= alpha:
+                alpha = g - window
+            else:
+                beta = g + window
+
     def MTDF(self, root, f, d):
         """
         L'algorithme de MTDF utilisant un null window pour accélérer la recherche de l'arbre de jeu
@@ -291,7 +449,6 @@ class AIPlayer(Player):
         upper_bound = +INF
         lower_bound = -INF
 
-        self.timer._start = time.time()
         while lower_bound < upper_bound and not self.timer.timeouts_soon():
             beta = max(g, lower_bound + 1)
             best_node, best_node_depth = self.minimax(d, root, beta - 1, beta)
@@ -305,7 +462,8 @@ class AIPlayer(Player):
 
         return best_node, best_node_depth
 
-    def minimax(self, depth, parent_node, alpha=-INF, beta=+INF, maximizing=True) -> (GameTree, int):
+    def minimax(self, depth, parent_node, alpha=-INF, beta=+INF, maximizing=True,
+                principal_variation=False) -> (GameTree, int):
         """
         Détermine le coup optimal à jouer selon l'algorithme minimax.
 
@@ -315,6 +473,7 @@ class AIPlayer(Player):
 
             alpha: le score minimum pour le joueur dont le score est maximisé
             beta: le score maximum pour le joueur dont le score est minimisé
+            principal_variation (bool): True pour évaluer les enfants après le premier avec un null window (PVS)
 
         Returns:
             Action: le meilleur coup trouvé dans la profondeur explorée
@@ -325,8 +484,18 @@ class AIPlayer(Player):
             - ɑ-β pruning
             - sorting nodes based on depth - 1 results (that we got thanks to iterative deepening).
                 this way, we first test the (probably) best results, and we will prune the rest (with ɑ-β)
+            - principal variation search: the first child is searched with the full window, the others with a null
+                window. They are only searched again with the full window if they can improve the result
+            - late move reductions: once the children are sorted, the late ones are first searched at a reduced depth
+                and only searched again at full depth on a fail-high
+            - forward pruning: only the best forward_pruning children of the previous iteration are searched
+            - staged move generation: children are generated one at a time (previous iteration's children, killer
+                moves, then queens by history heuristic with arrows generated on demand) and generation stops at a
+                cutoff
 
         """
+        self.nodes_count += 1
+
         best_child = None
         best_score_remaining_depth = depth
 
@@ -349,20 +518,47 @@ class AIPlayer(Player):
             parent_node.score = self.objective_function()
             return parent_node, 0
 
-        if not parent_node.children:
-            parent_node.children[:] = [GameTree(action) for action in self.fast_board.possible_actions(player)]
-
         # A sorted list will significantly speed up alpha-beta pruning
-        if any(child.score is not None for child in parent_node.children):
+        is_ordered = any(child.score is not None for child in parent_node.children)
+        if is_ordered:
+            # les enfants qui n'ont pas encore été évalués sont mis à la fin
+            unknown_score = -INF if maximizing else +INF
             parent_node.children.sort(
-                key=lambda child: child.score if child.score is not None else +INF,
+                key=lambda child: child.score if child.score is not None else unknown_score,
                 reverse=maximizing
             )
 
-        for child in parent_node.children:
+        if is_ordered and self.forward_pruning is not None:
+            children = parent_node.children[:self.forward_pruning]
+        else:
+            children = self.staged_children(parent_node, player)
+
+        for i, child in enumerate(children):
             self.fast_board.act(*child.action, player)
 
-            new_child, remaining_depth = self.minimax(depth - 1, child, alpha, beta, not maximizing)
+            reduced_depth = depth - 1 - self.lmr_reduction
+            if is_ordered and self.lmr_min_moves is not None and i >= self.lmr_min_moves and reduced_depth >= 0:
+                # late move reduction: null window à profondeur réduite
+                null_alpha, null_beta = (alpha, alpha + 1) if maximizing else (beta - 1, beta)
+                new_child, remaining_depth = self.minimax(reduced_depth, child, null_alpha, null_beta,
+                                                          not maximizing, principal_variation)
+                # l'enfant n'est réévalué à pleine profondeur que s'il peut améliorer le résultat (fail-high)
+                full_depth_search = new_child.score > alpha if maximizing else new_child.score < beta
+            else:
+                full_depth_search = True
+
+            if full_depth_search:
+                if principal_variation and i > 0:
+                    # null window: on vérifie seulement si l'enfant peut améliorer alpha (ou beta)
+                    null_alpha, null_beta = (alpha, alpha + 1) if maximizing else (beta - 1, beta)
+                    new_child, remaining_depth = self.minimax(depth - 1, child, null_alpha, null_beta,
+                                                              not maximizing, True)
+                    if alpha < new_child.score < beta:
+                        new_child, remaining_depth = self.minimax(depth - 1, child, alpha, beta, not maximizing,
+                                                                  True)
+                else:
+                    new_child, remaining_depth = self.minimax(depth - 1, child, alpha, beta, not maximizing,
+                                                              principal_variation)
 
             score = new_child.score
             child.score = score
@@ -383,6 +579,7 @@ class AIPlayer(Player):
 
                 # alpha-beta pruning
                 if beta <= alpha:
+                    self.store_cutoff(child.action, depth)
                     break
 
             if self.timer.timeouts_soon():
@@ -399,6 +596,52 @@ class AIPlayer(Player):
 
         return best_child, best_score_remaining_depth
 
+    def staged_children(self, parent_node, player):
+        """
+        Génère les enfants de parent_node au fur et à mesure qu'ils sont évalués (c.f. génération par étapes)
+
+        parent_node: GameTree
+            le noeud dont les enfants sont générés, chaque nouvel enfant y est ajouté
+        player: int
+            le joueur qui joue les actions des enfants
+
+        return: generator de GameTree
+        """
+        # les enfants déjà générés, triés par minimax si ils ont été évalués
+        yield from list(parent_node.children)
+        if parent_node.all_children_generated:
+            return
+
+        known_actions = {child.action for child in parent_node.children}
+
+        ply = len(self.fast_board.history)
+        for action in list(self.killers.get(ply, ())):
+            if action not in known_actions and self.fast_board.is_legal_action(action, player):
+                known_actions.add(action)
+                child = GameTree(action)
+                parent_node.children.append(child)
+                yield child
+
+        queens = sorted(self.fast_board.queens[player], key=lambda queen: self.history_heuristic.get(queen, 0),
+                        reverse=True)
+        for action in self.fast_board.iter_actions(player, queens):
+            if action not in known_actions:
+                child = GameTree(action)
+                parent_node.children.append(child)
+                yield child
+
+        parent_node.all_children_generated = True
+
+    def store_cutoff(self, action, depth):
+        """Enregistre l'action qui a causé une coupure alpha-beta comme killer move et dans l'history heuristic"""
+        killers = self.killers.setdefault(len(self.fast_board.history), [])
+        if action not in killers:
+            killers.insert(0, action)
+            del killers[2:]
+
+        queen = action[0]
+        self.history_heuristic[queen] = self.history_heuristic.get(queen, 0) + depth * depth
+
     def objective_function(self):
         """
         La fonction pour évaluer le plateau
@@ -408,6 +651,103 @@ class AIPlayer(Player):
         return self.fast_board.heuristics_linear_comb()
 
 
+class MCTSPlayer(FastBoardPlayer):
+    """
+    Une intelligence artificielle pour le jeu des Amazones utilisant Monte Carlo Tree Search (MCTS)
+
+    Tant qu'il reste du temps, une itération est effectuée:
+        Sélection:
+            À partir de la racine, l'enfant qui maximise UCT (wins / visits + c * sqrt(ln(parent visits) / visits))
+            est choisi jusqu'à atteindre une feuille. Les enfants jamais visités sont choisis en premier.
+        Expansion:
+            Lorsqu'une feuille est atteinte pour la deuxième fois, toutes ses actions possibles deviennent ses
+            enfants et un de ceux-ci est choisi.
+        Simulation:
+            playouts parties aléatoires sont jouées depuis ce noeud par une fonction pré-compilée avec Numba.
+            Après max_plies actions, le gagnant d'une partie est déterminé par le territoire.
+        Rétropropagation:
+            Les victoires et le nombre de parties sont ajoutés à tous les noeuds du chemin.
+
+    L'action renvoyée est l'enfant de la racine le plus visité.
+    """
+
+    def __init__(self, board, player_id, timeout=2, exploration=MCTS_EXPLORATION_DEFAULT,
+                 playouts=MCTS_PLAYOUTS_DEFAULT, max_plies=MCTS_MAX_PLIES_DEFAULT):
+        super().__init__(board, player_id, timeout)
+        self.exploration = exploration
+        self.playouts = playouts
+        self.max_plies = max_plies
+
+        self.tree = None
+        self.iterations_count = 0  # nombre d'itérations du dernier coup
+
+    def new_for_board(self, board):
+        """MCTSPlayer: renvoie un nouveau joueur avec les mêmes paramètres pour le plateau board"""
+        return type(self)(board, self.player_id, self.timeout, self.exploration, self.playouts, self.max_plies)
+
+    def find_action(self):
+        """
+        Détermine le meilleur coup à jouer via MCTS
+
+        Returns:
+            tuple: (Action, tuple(from, to, arrow))
+        """
+        from src.models.mcts_tree import MCTSTree
+        self.tree = MCTSTree()
+        self.iterations_count = 0
+
+        while not self.timer.timeouts_soon():
+            self.iterate()
+            self.iterations_count += 1
+
+        best_child = self.tree.most_visited_child(self.tree.ROOT)
+        if best_child is None:
+            raise Exception("L'IA n'a pas réussi à trouver d'actions")
+
+        action_tuple = self.tree.action(best_child)
+        action = self.fast_board.seq_action_to_action(action_tuple, self.player_id)
+        return action, action_tuple
+
+    def iterate(self):
+        """Effectue une itération de MCTS (sélection, expansion, simulation, rétropropagation)"""
+        tree = self.tree
+        node = tree.ROOT
+        player = self.player_id  # le joueur qui doit jouer au noeud node
+        path = [node]
+
+        # sélection
+        while tree.is_expanded(node) and tree.num_children[node] > 0:
+            node = tree.select_child(node, self.exploration)
+            player = self.play_node(node, player)
+            path.append(node)
+
+        # expansion (une feuille n'est développée qu'à partir de sa deuxième visite)
+        if not tree.is_expanded(node) and (node == tree.ROOT or tree.visits[node] > 0):
+            tree.expand(node, self.fast_board.possible_actions_array(player))
+            if tree.num_children[node] > 0:
+                node = tree.first_child[node]  # les enfants sont mélangés lors de l'expansion
+                player = self.play_node(node, player)
+                path.append(node)
+
+        # simulation
+        if tree.is_expanded(node) and tree.num_children[node] == 0:
+            wins = 0  # le joueur qui doit jouer n'a plus d'action possible: il a perdu
+        else:
+            seed = random.getrandbits(63)
+            wins = self.fast_board.random_playouts(player, self.playouts, seed, self.max_plies)
+
+        # rétropropagation: les victoires sont comptées pour le joueur qui a joué l'action du noeud
+        tree.backpropagate(path, self.playouts - wins, self.playouts)
+
+        for _ in range(len(path) - 1):
+            self.fast_board.undo()
+
+    def play_node(self, node, player):
+        """Joue l'action du noeud node pour le joueur player sur fast_board et renvoie le joueur suivant"""
+        self.fast_board.act(*self.tree.action(node), player)
+        return PLAYER_2 if player == PLAYER_1 else PLAYER_1
+
+
 class Timer:
     """Simple chronomètre"""
     def __init__(self, time_limit=None):
@@ -420,6 +760,10 @@ class Timer:
         """Arrête le chronomètre"""
         self._end = time.time()
 
+    def cancel(self):
+        """Fait dépasser la limite de temps immédiatement"""
+        self._time_limit = 0
+
     @property
     def time(self):
         """Renvoie le temps écoulé depuis que le chronomètre a été lancé"""
@@ -434,301 +778,16 @@ class Timer:
         except TypeError:
             raise ValueError("No time limit defined")
 
-    def timeouts_soon(self):
+    @property
+    def remaining(self):
+        """Renvoie le temps restant avant d'atteindre le seuil de self.timeouts_soon_threshold"""
         try:
-            return self._time_limit <= self.time + self.timeouts_soon_threshold
+            return self._time_limit - self.time - self.timeouts_soon_threshold
         except TypeError:
             raise ValueError("No time limit defined")
 
-
-class FastBoard:
-    """Classe représentant le plateau de jeu plus rapide que Board"""
-    DIRECTIONS = np.array([(i, j) for i in range(-1, 2, 1) for j in range(-1, 2, 1) if not 0 == i == j], dtype=np.int8)
-
-    def __init__(self, board, player):
-        self.N = board.N
-        self.num_tiles = self.N ** 2
-
-        self.history = []
-
-        self.grid = np.array(board.grid.grid, dtype=np.int8)
-        self.queens = [list(map(tuple, np.argwhere(self.grid == q))) for q in (PLAYER_1, PLAYER_2)]
-        self.empty_cells = self.grid == EMPTY
-
-        self.player = player
-        self.other_player = PLAYER_1 if player == PLAYER_2 else PLAYER_2
-
-        self.moves_cache = np.full((self.N, self.N, self.num_tiles, 2), -1, dtype=np.int8)
-
-    def _clear_cache(self):
-        # supprime le cache des pour toutes les méthodes
-        self.possible_moves_numba.cache_clear()
-        self.possible_actions.cache_clear()
-        self.has_moves.cache_clear()
-        self.is_current_player_turn.cache_clear()
-        self.moves_cache[:] = -1
-
-    @lru_cache
-    def is_current_player_turn(self):
-        """bool: renovie si c'est au joueur actuel de joueur"""
-        if self.history:
-            return self.history[-1][-1] == self.other_player  # si il y a déjà eu des tours
-        return self.player == PLAYER_1  # si aucun tour n'a été joué, le premier joueur sera le joueur 1
-
-    @property
-    def status(self):
-        """EndOfGameStatus: renvoie l'état du jeu"""
-        scores = []
-        for p in (PLAYER_1, PLAYER_2):
-            scores.append(self.has_moves(p))
-        if all(scores):
-            return EndOfGameStatus()
-        else:
-            return EndOfGameStatus(*map(int, scores))
-
-    def heuristics_linear_comb(self, mobility_coef=2, terr_coef=8, reach_coef=8, relative_terr_coef=2):
-        """int: Renvoie la combinaison linéaire des heuristiques"""
-        mob = self.mobility()
-        terr, reach, relative_terr = self.territory_reachability()
-
-        return mobility_coef * mob + terr_coef * terr + reach_coef * reach + relative_terr_coef * relative_terr
-
-    @staticmethod
-    def seq_action_to_action(seq_action, player):
-        """
-        action_seq: convertit la séquence sous forme ((from_y, from_x), (to_y, to_x), (arr_y, arr_x)) en Action
-        player: int: l'id du joueur actuel
-
-        return: Action
-        """
-        from_pos = Pos2D(*seq_action[0])
-        to_pos = Pos2D(*seq_action[1])
-        arr_pos = Pos2D(*seq_action[2])
-        action = Action(from_pos, to_pos, arr_pos, player)
-        return action
-
-    def act(self, from_pos, to_pos, arr_pos, player):
-        """
-        Effectue l'action donnée
-        from_pos: séquence de taille 2
-        to_pos: séquence de taille 2
-        arr_pos: séquence de taille 2
-        player: int: l'id du joueur
-        """
-        self.history.append((from_pos, to_pos, arr_pos, player))
-
-        self.permutate(from_pos, to_pos)
-        self.grid[arr_pos] = ARROW
-
-        # refresh empty cells
-        self.empty_cells[from_pos] = True  # mettre from_pos avant arr_pos si jamais arr_pos == from_pos
-        self.empty_cells[arr_pos] = False
-        self.empty_cells[to_pos] = False
-
-        # refresh queens positions
-        self.queens[player][self.queens[player].index(tuple(from_pos))] = to_pos
-
-        self._clear_cache()
-
-    def act_action(self, action):
-        """Effectue l'Action action"""
-        from_pos = action.old_pos.y, action.old_pos.x
-        to_pos = action.new_pos.y, action.new_pos.x
-        arr_pos = action.arrow_pos.y, action.arrow_pos.x
-        self.act(from_pos, to_pos, arr_pos, action.player_id)
-
-    def _player_reachability(self, player):
-        # renvoie la grille représentant le nombre de mouvement que chaque joueur devrait
-        # faire afin d'atteindre chaque case
-        prev_added = np.empty((self.num_tiles, 2), dtype=np.int8)
-        prev_added_idx = len(self.queens[player])
-        prev_added[:prev_added_idx] = self.queens[player]
-        res = fast_board.reachability_grid(
-            self.grid,
-            self.N,
-            self.DIRECTIONS,
-            self.num_tiles,
-            self.empty_cells,
-            self.moves_cache,
-            prev_added,
-            prev_added_idx
-        )
-        return res
-
-    def mobility(self):
-        """return: int: le nombre total de mouvements que le joueur peut faire (pas actions!)"""
-        mobility_grid = np.zeros_like(self.grid, dtype=np.int8)
-
-        for player in PLAYERS:
-            add = 1 if player == self.player else -1
-            for queen in self.queens[player]:
-                possible_moves = fast_board.possible_moves(self.DIRECTIONS,
-                                                           self.N,
-                                                           self.num_tiles,
-                                                           self.empty_cells,
-                                                           np.array(queen, dtype=np.int8),
-                                                           self.moves_cache,
-                                                           False
-                                                           )
-
-                for move in possible_moves:
-                    mobility_grid[tuple(move)] += add
-        return np.sum(mobility_grid)
-
-    def territory_reachability(self):
-        """
-        Renvoie la différence entre le nombre de cases qui appartiennent à chaque joueur ainsi que la différence
-        entre les cases atteignables.
-        Le territoire d'un joueur est défini comme suit:
-            Une case appartient à un joueur si il peut atteindre cette case en moins de mouvements
-            (sans considérer la phase du tir des flèches), que l'autre joueur.
-        Les cases atteignables sont définis tel que une cases atteignable est une cases qu'un joueur peut atteindre
-        return: (int, int)
-        """
-        this_reachability = self._player_reachability(self.player)
-        other_reachability = self._player_reachability(self.other_player)
-
-        # si m[i, j] > 0, m[i, j] appartient au joueur actuel, si m[i, j] = 0, aucun, sinon l'autre joueur
-
-        is_curr_player_turn = self.is_current_player_turn()
-        territory_grid = self._whos_territory(this_reachability, other_reachability)
-
-        if not is_curr_player_turn:
-            territory_grid[territory_grid == 1] = -1
-
-        territory = np.sum(territory_grid) // 4
-        reachability = np.count_nonzero(this_reachability) - np.count_nonzero(other_reachability)
-        relative_territory = np.sum(self._whos_relative_territory(this_reachability, other_reachability))
-
-        return territory, reachability, relative_territory
-
-
-
-    @staticmethod
-    @numba.vectorize('int8(int8, int8)', cache=True)
-    def _whos_territory(p1_reachability, p2_reachability):
-        """
-        Renvoie 1 si le territoire appartient à p1, -1 si p2 et 0 si le territoire appartient à personne
-        p1_reachability, p2_reachability sont des scalaires (int) et représentent le nombre de mouvement
-        que chacun des joueurs
-        """
-        # on utilise un facteur de 4 car numba.vectorize ne prend pas de constantes et par la suite,
-        # un point positif ou neé
-        if p1_reachability > p2_reachability > 0 or p2_reachability > p1_reachability == 0:
-            return -4
-        elif p2_reachability > p1_reachability > 0 or p1_reachability > p2_reachability == 0:
-            return 4
-        elif p1_reachability == p2_reachability > 0:
-            return 1
-        return 0
-
-    @staticmethod
-    @numba.vectorize('int8(int8, int8)', cache=True)
-    def _whos_relative_territory(p1_reachability, p2_reachability):
-        """
-        Renvoie p2 - p1 si les deux joueurs peuvent atteindre la case, 4 si seulement ce joueur peut, -4 sinon
-        """
-        if p1_reachability == p2_reachability == 0:
-            return 0
-        elif p1_reachability > 0 and p2_reachability == 0:
-            return 4
-        elif p1_reachability == 0 and p2_reachability > 0:
-            return -4
-        else:
-            return p2_reachability - p1_reachability
-
-
-    def last_moved_queen_influence(self):
-        """
-        Renvoie le nombre de mouvements possibles de la dernière reine déplacée
-        """
+    def timeouts_soon(self):
         try:
-            queen = self.history[-1][0]
-        except IndexError:
-            return 0
-        else:
-            possible_moves = fast_board.possible_moves(self.DIRECTIONS,
-                                                       self.N,
-                                                       self.num_tiles,
-                                                       self.empty_cells,
-                                                       np.array(queen, dtype=np.int8),
-                                                       self.moves_cache,
-                                                       False
-                                                       )
-            return len(possible_moves)
-
-    def mobility_evaluation(self):
-        """Renvoie la différence entre le nombre d'actions possibles des reines"""
-        return len(self.possible_actions(self.player)) - len(self.possible_actions(self.other_player))
-
-    def permutate(self, pos1, pos2):
-        """Permute deux cases du plateau"""
-        self.grid[pos1], self.grid[pos2] = self.grid[pos2], self.grid[pos1]
-
-    # def monte_carlo(self, depth):
-
-    def undo(self):
-        """Annule la dernière action effectuée"""
-        from_pos, to_pos, arr_pos, player = self.history.pop()
-
-        # supprimer la flèche avant de permutter si la flèche est à la position de départ de la reine
-        self.grid[arr_pos] = EMPTY
-        self.permutate(from_pos, to_pos)
-
-        self.empty_cells[arr_pos] = True
-        self.empty_cells[to_pos] = True
-        self.empty_cells[from_pos] = False
-
-        self.queens[player][self.queens[player].index(to_pos)] = from_pos
-
-        self._clear_cache()
-
-    @lru_cache
-    def has_moves(self, player):
-        """Fonction booléenne qui renvoie si le joueur player peut joueur"""
-        return len(self.possible_actions(player, return_first_found=True)) > 0
-
-    def __repr__(self):
-        res = ''
-        for col in self.grid[::-1]:
-            for cell in col:
-                res += CHARS[cell] + ' '
-            res += '\n'
-        return res
-
-    @lru_cache
-    def possible_moves_numba(self, from_pos, ignore_pos=None, return_first_found=False):
-        """Renvoie les mouvements possibles à partir de from_pos"""
-        if ignore_pos:
-            ignore_pos_np = np.array(ignore_pos, dtype=np.int8)
-            res = fast_board.possible_moves_ignore_pos(self.DIRECTIONS,
-                                            self.N,
-                                            self.num_tiles,
-                                            self.empty_cells,
-                                            np.array(from_pos, dtype=np.int8),
-                                            ignore_pos_np,
-                                            return_first_found)
-        else:
-            res = fast_board.possible_moves(self.DIRECTIONS,
-                                             self.N,
-                                             self.num_tiles,
-                                             self.empty_cells,
-                                             np.array(from_pos, dtype=np.int8),
-                                             self.moves_cache,
-                                             return_first_found)
-        res = tuple(map(tuple, res))
-        return res
-
-    @lru_cache
-    def possible_actions(self, player, return_first_found=False):
-        """Renvoie toutes les actions possibles pour un joueur sous forme de liste"""
-        actions = []
-        for queen in self.queens[player]:
-            for queen_move in self.possible_moves_numba(queen):
-                for arr_move in self.possible_moves_numba(queen_move, ignore_pos=queen,
-                                                          return_first_found=return_first_found):
-                    res = (queen, queen_move, arr_move)
-                    if return_first_found:
-                        return res
-                    actions.append(res)
-        return actions
+            return self._time_limit <= self.time + self.timeouts_soon_threshold
+        except TypeError:
+            raise ValueError("No time limit defined")
@@ -0,0 +1,102 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import threading
+import time
+from src.const import PLAYER_1, PLAYER_2, WARM_UP_BOARD
+
+
+def run_hot_paths():
+    """Exécute une fois chaque fonction utilisée par les joueurs artificiels sur un petit plateau"""
+    from src.models.board import Board
+    from src.models.players import fast_board_class  # charge ou compile les fonctions pré-compilées
+
+    fast_board = fast_board_class()(Board(*WARM_UP_BOARD), PLAYER_1)
+    fast_board.heuristics()
+    fast_board.mobility()
+    fast_board.territory_reachability()
+    fast_board.has_moves(PLAYER_2)
+    list(fast_board.iter_actions(PLAYER_2))
+
+    actions = fast_board.possible_actions(PLAYER_1)
+    fast_board.act(*actions[0], PLAYER_1)
+    fast_board.last_moved_queen_influence()
+    fast_board.undo()
+
+    fast_board.random_playouts(PLAYER_1, 2, 0)
+    fast_board.first_move_statistics(PLAYER_1, 2, 0)
+    if hasattr(fast_board, 'possible_actions_array'):  # MCTSPlayer n'est disponible qu'avec numpy
+        from src.models.mcts_tree import MCTSTree
+        tree = MCTSTree()
+        tree.expand(tree.ROOT, fast_board.possible_actions_array(PLAYER_1))
+
+
+class WarmUp:
+    """
+    Préchauffe le moteur des joueurs artificiels dans un thread en arrière-plan: les fonctions pré-compilées sont
+    chargées (ou compilées, c.f. engine.load_engine) et chaque chemin critique est exécuté une fois, pour que la
+    première action chronométrée d'une IA ne soit pas ralentie.
+
+    Attributes:
+        status (str): PENDING, RUNNING, DONE ou FAILED
+        error (Exception): l'erreur survenue pendant le préchauffage (None sinon)
+        duration (float): la durée du préchauffage en secondes (None tant qu'il n'est pas terminé)
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self):
+        self.status = self.PENDING
+        self.error = None
+        self.duration = None
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Lance le préchauffage en arrière-plan, sans effet s'il a déjà été lancé"""
+        with self._lock:
+            if self.status != self.PENDING:
+                return
+            self.status = self.RUNNING
+        threading.Thread(target=self._run, name='warm-up', daemon=True).start()
+
+    def _run(self):
+        start = time.time()
+        try:
+            run_hot_paths()
+        except Exception as e:
+            self.error = e
+            self.status = self.FAILED
+        else:
+            self.status = self.DONE
+        finally:
+            self.duration = time.time() - start
+            self._finished.set()
+
+    @property
+    def finished(self):
+        """bool: renvoie si le préchauffage est terminé (avec ou sans erreur)"""
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Attend la fin du préchauffage s'il a été lancé
+
+        Args:
+            timeout (float): le temps d'attente maximal en secondes (None: pas de limite)
+
+        Returns:
+            bool: False si le préchauffage n'est toujours pas terminé après timeout secondes
+        """
+        if self.status == self.PENDING:
+            return True
+        return self._finished.wait(timeout)
+
+
+# préchauffage partagé par tout le processus
+warm_up = WarmUp()
@@ -5,27 +5,44 @@ Matricule:  521935
 """
 
 from PyQt5.QtWidgets import QGraphicsScene, QGraphicsItem, QGraphicsSceneMouseEvent, QGraphicsObject, QGraphicsEllipseItem
-from PyQt5.QtCore import QPointF, Qt, QRectF, QPropertyAnimation, QEasingCurve
+from PyQt5.QtCore import QPointF, Qt, QRectF, QSizeF, QPropertyAnimation, QEasingCurve
 from PyQt5.QtGui import QPixmap, QBrush, QPen, QColor
 from src.views.sound import AmazonsSound
-from src.const import QUEEN_ICONS, PLAYERS, ARROW_ICON, REACHABLE_INDICATOR_SIZE_TO_TILE_SIZE_RATIO
+from src.const import QUEEN_ICONS, PLAYERS, ARROW, ARROW_ICON, REACHABLE_INDICATOR_SIZE_TO_TILE_SIZE_RATIO, \
+    PIXMAP_CACHE_MAX_SIZE, PAINTED_BOARD_MIN_SIZE
 import math
 
 
 class BoardScene(QGraphicsScene):
-    """QGraphicsScene d'un plateau"""
+    """
+    QGraphicsScene d'un plateau
+
+    Les cases sont dessinées dans l'arrière-plan de la scène (mis en cache par BoardView). Les reines sont des
+    QGraphicsItem. Les flèches et les marqueurs de destination possible sont aussi des QGraphicsItem, sauf en mode
+    dessiné (c.f. painted) où un seul BoardItem les dessine depuis arrows et indicated_moves.
+
+    Attributes:
+        painted_mode (bool): True pour le mode dessiné, False pour un élément par flèche et par marqueur, None pour
+                             choisir selon la taille du plateau (PAINTED_BOARD_MIN_SIZE)
+    """
 
     MOVE_TO_COLOR = QColor(200, 244, 100)
     POSSIBLE_MOVE_INDICATOR_COLOR = QColor(255, 255, 255)
     POSSIBLE_MOVE_INDICATOR_COLOR_HIGHLIGHTED = QColor(255, 150, 100)
     ARROW_SIZE_TO_TILE_SIZE_RATIO = 0.4
 
-    def __init__(self, scene_delegate, board_delegate, n, *args, **kwargs):
+    def __init__(self, scene_delegate, board_delegate, n, *args, painted_mode=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.board_delegate = board_delegate
         self.scene_delegate = scene_delegate
+        self.painted_mode = painted_mode
+        self.board_item = None
 
-        self.queens_pixmaps = {player: QPixmap(QUEEN_ICONS[player]) for player in PLAYERS}
+        # images originales des reines (clé: joueur) et de la flèche (clé: ARROW)
+        self.original_pixmaps = {player: QPixmap(QUEEN_ICONS[player]) for player in PLAYERS}
+        self.original_pixmaps[ARROW] = QPixmap(ARROW_ICON)
+        self.scaled_pixmaps_cache = {}  # (clé, taille, antialiasing) -> QPixmap
+        self.smooth_pixmaps = True  # False pendant un redimensionnement de la fenêtre
 
         self.n = n
         self.pixel_board_size = 0
@@ -40,10 +57,11 @@ class BoardScene(QGraphicsScene):
 
         self.tile_brushes = QBrush(QColor(175, 50, 50, 255)), QBrush(QColor(255, 215, 200, 255))
 
-        self.tiles_graphics_items = {}
+        self.tile_colors = {}  # case -> QColor des cases dont la couleur a été changée
 
         self.possible_moves = []
         self.possible_move_indicators_items = {}
+        self.indicated_moves = []  # destinations marquées en mode dessiné
 
         self.prev_tile_under_mouse_pos = None
         self.moving_queen = None
@@ -62,10 +80,11 @@ class BoardScene(QGraphicsScene):
 
     def cleanup_board(self):
         """Nettoie le plateau de toutes les données"""
-        self.tiles_graphics_items = {}
+        self.tile_colors = {}
 
         self.possible_moves = []
         self.possible_move_indicators_items = {}
+        self.indicated_moves = []
 
         self.pieces = {}
         self.pieces_graphics_items = {}
@@ -75,18 +94,42 @@ class BoardScene(QGraphicsScene):
 
         self.ongoing_action = []
 
+    @property
+    def painted(self):
+        """bool: True si les flèches et les marqueurs sont dessinés par self.board_item"""
+        if self.painted_mode is None:
+            return self.n >= PAINTED_BOARD_MIN_SIZE
+        return self.painted_mode
+
     def _draw(self):
         """Dessine toutes les cases du plateau"""
-        pen = QPen(Qt.transparent)
-
-        for i in range(self.n):
-            for j in range(self.n):
-                brush = self.piece_brush(i, j)
-                tile_rect = self.get_tile_rect(i, j)
-                self.tiles_graphics_items[(i, j)] = self.addRect(tile_rect, pen, brush)
-
+        self.invalidate(self.sceneRect(), QGraphicsScene.BackgroundLayer)
+        self.board_item = None
+        if self.painted:
+            self.board_item = BoardItem(self)
+            self.addItem(self.board_item)
         self.draw_pieces()
 
+    def drawBackground(self, painter, rect):
+        """Dessine les cases du plateau qui intersectent rect (une seule fois par taille, c.f. BoardView)"""
+        super(BoardScene, self).drawBackground(painter, rect)
+        if self.tile_pixel_size <= 0:
+            return
+        # seules les cases visibles dans rect sont dessinées
+        first_i, last_i = self._tiles_range(rect.top() - self.top_right_point.y(), rect.height())
+        first_j, last_j = self._tiles_range(rect.left() - self.top_right_point.x(), rect.width())
+        for i in range(first_i, last_i):
+            for j in range(first_j, last_j):
+                color = self.tile_colors.get((i, j))
+                brush = self.piece_brush(i, j) if color is None else QBrush(color)
+                painter.fillRect(self.get_tile_rect(i, j), brush)
+
+    def _tiles_range(self, offset, length):
+        # indices des cases (sur un axe) entre offset et offset+length pixels du coin du plateau
+        first = max(0, int(offset // self.tile_pixel_size))
+        last = min(self.n, int((offset + length) // self.tile_pixel_size) + 1)
+        return first, last
+
     def get_tile_rect(self, i, j):
         """Renvoie le rectangle de la case i, j du plateau"""
         return QRectF(
@@ -108,14 +151,23 @@ class BoardScene(QGraphicsScene):
         for piece_player, piece_graphical_item in self.pieces_graphics_items.items():
             piece_graphical_item.setFlag(QGraphicsItem.ItemIsSelectable, False)
 
-    def resize(self, rect):
-        """Change la taille du plateau à rect"""
+    def resize(self, rect, smooth=True):
+        """
+        Change la taille du plateau à rect
+
+        Args:
+            rect (QRect): le rectangle disponible
+            smooth (bool): False pour redimensionner les images sans antialiasing (rapide, pendant le redimensionnement
+                           de la fenêtre)
+        """
+        if self.board_item is not None:
+            self.board_item.geometry_will_change()
         self.pixel_board_size = min(rect.height(), rect.width())
         self.top_right_point = rect.center() - QPointF(*(self.pixel_board_size / 2,) * 2)
 
         self.tile_pixel_size = self.pixel_board_size / self.n
-        for tile_pos, tile in self.tiles_graphics_items.items():
-            tile.setRect(self.get_tile_rect(*tile_pos))
+        self.smooth_pixmaps = smooth
+        self.invalidate(self.sceneRect(), QGraphicsScene.BackgroundLayer)
 
         pixmaps = self.get_scaled_pieces_pixmaps()
         for piece_pos, piece in self.pieces_graphics_items.items():
@@ -136,8 +188,21 @@ class BoardScene(QGraphicsScene):
         """
         Renvoie l'image de la reine du joueur ``player`` comme QPixmap à l'échelle d'une case tu plateau
         """
-        original_pixmap = self.queens_pixmaps[player]
-        return self.scale_pixmap_tile_size(original_pixmap)
+        return self.scaled_pixmap(player)
+
+    def scaled_pixmap(self, key):
+        """
+        Renvoie l'image original_pixmaps[key] à la taille d'une case, depuis le cache si elle a déjà été
+        redimensionnée à cette taille
+        """
+        cache_key = key, int(self.tile_pixel_size), self.smooth_pixmaps
+        pixmap = self.scaled_pixmaps_cache.get(cache_key)
+        if pixmap is None:
+            if len(self.scaled_pixmaps_cache) >= PIXMAP_CACHE_MAX_SIZE:
+                self.scaled_pixmaps_cache.clear()  # tailles d'un redimensionnement terminé
+            pixmap = self.scale_pixmap_tile_size(self.original_pixmaps[key], self.smooth_pixmaps)
+            self.scaled_pixmaps_cache[cache_key] = pixmap
+        return pixmap
 
     def get_arrow_rect(self, i, j):
         """Renvoie le rectangle du cercle des flèches"""
@@ -150,7 +215,7 @@ class BoardScene(QGraphicsScene):
         return self.tile_brushes[(i + j) % 2]
 
     def redraw_pieces(self):
-        """redessine les pièces et les flèches"""
+        """redessine toutes les pièces et les flèches (les mises à jour d'une partie sont incrémentales)"""
         for pos, piece_item in list(self.pieces_graphics_items.items()) + list(self.arrows_graphics_items.items()):
             self.removeItem(piece_item)
         self.draw_pieces()
@@ -166,8 +231,17 @@ class BoardScene(QGraphicsScene):
         for pos in self.arrows:
             self.add_arrow_graphics_item(pos)
 
+    def board_rect(self):
+        """Renvoie le rectangle de tout le plateau"""
+        return QRectF(self.top_right_point, QSizeF(self.pixel_board_size, self.pixel_board_size))
+
     def add_arrow_graphics_item(self, pos):
         """Ajoute une flèche sous forme de cercle à la position pos"""
+        if self.board_item is not None:
+            # la flèche est déjà dans self.arrows, seule sa case doit être redessinée
+            self.board_item.update(self.get_arrow_rect(*pos))
+            return
+
         pen = QPen(QColor(0, 0, 0, 255))
         brush = QBrush(QColor(0, 0, 0, 255))
 
@@ -175,10 +249,10 @@ class BoardScene(QGraphicsScene):
 
         self.arrows_graphics_items[pos] = arrow
 
-    def scale_pixmap_tile_size(self, pixmap):
-        """Redimensionne le pixmap à la taille d'une case avec le antialiasing"""
+    def scale_pixmap_tile_size(self, pixmap, smooth=True):
+        """Redimensionne le pixmap à la taille d'une case avec le antialiasing (sauf si smooth vaut False)"""
         return pixmap.scaled(*(int(self.tile_pixel_size),) * 2,
-                             transformMode=Qt.SmoothTransformation)
+                             transformMode=Qt.SmoothTransformation if smooth else Qt.FastTransformation)
 
     def _draw_piece_from_prescaled_pixmap(self, pos, pixmap):
         """
@@ -187,7 +261,7 @@ class BoardScene(QGraphicsScene):
         pixmap: QPixmap qui est déjà à l'échelle d'une case du plateau
         """
         pixmap_item = self.addPixmap(pixmap)
-        rect = pixmap_item.mapRectFromParent(self.tiles_graphics_items[pos].rect())
+        rect = pixmap_item.mapRectFromParent(self.get_tile_rect(*pos))
         pixmap_item.setPos(rect.topLeft())
 
         self.pieces_graphics_items[pos] = pixmap_item
@@ -201,27 +275,30 @@ class BoardScene(QGraphicsScene):
             while self.possible_move_indicators_items:
                 indicator = self.possible_move_indicators_items.popitem()[1]
                 self.removeItem(indicator)
+            if self.indicated_moves:
+                self.indicated_moves = []
+                self.board_item.update()
             for tile_pos in self.possible_moves:
-                self.tiles_graphics_items[tile_pos].setBrush(self.piece_brush(*tile_pos))
+                if self.tile_colors.pop(tile_pos, None) is not None:
+                    self.invalidate(self.get_tile_rect(*tile_pos), QGraphicsScene.BackgroundLayer)
 
     def add_pieces(self, players):
-        """Ajoute les reines données et les dessine"""
-        self.pieces.update(players)
-        self.redraw_pieces()
+        """Ajoute les reines données et ne dessine qu'elles (une reine déjà sur la case est remplacée)"""
+        scaled_pixmaps = self.get_scaled_pieces_pixmaps()
+        for pos, player in players.items():
+            previous_item = self.pieces_graphics_items.pop(pos, None)
+            if previous_item is not None:
+                self.removeItem(previous_item)
+            self.pieces[pos] = player
+            self._draw_piece_from_prescaled_pixmap(pos, scaled_pixmaps[player])
 
     def add_arrows(self, arrows):
-        """Ajoute les flèches données et les dessine"""
-        self.arrows += arrows
-
-        # flags are saved to make sure that queens that were selectable will still be selectable after the redraw
-        temp_flags = {pos: item.flags() for pos, item in self.pieces_graphics_items.items()}
-
-        self.redraw_pieces()
-
-        for pos, item in self.pieces_graphics_items.items():
-            flags = temp_flags.get(pos, None)
-            if flags is not None:
-                item.setFlags(flags)
+        """
+        Ajoute les flèches données et ne dessine qu'elles: les autres pièces (et leur sélection) restent inchangées
+        """
+        for pos in arrows:
+            self.arrows.append(pos)
+            self.add_arrow_graphics_item(pos)
 
     def redraw(self, n, rect):
         """Redessine les cases du plateau"""
@@ -236,10 +313,8 @@ class BoardScene(QGraphicsScene):
 
     def set_tile_color(self, tile_pos, color):
         """Change de couleur d'une case du plateau"""
-        tile = self.tiles_graphics_items[tile_pos]
-        tile_brush = tile.brush()
-        tile_brush.setColor(color)
-        tile.setBrush(tile_brush)
+        self.tile_colors[tile_pos] = color
+        self.invalidate(self.get_tile_rect(*tile_pos), QGraphicsScene.BackgroundLayer)
 
     def get_outlined_tile_at_coord(self, piece_pos: QPointF):
         """
@@ -249,8 +324,7 @@ class BoardScene(QGraphicsScene):
         """
         # puis essayer de trouver une case dont avec une plus grande intersection
         for tile_pos in self.possible_moves:
-            tile = self.tiles_graphics_items[tile_pos]
-            if tile.rect().contains(piece_pos):
+            if self.get_tile_rect(*tile_pos).contains(piece_pos):
                 return tile_pos
         return None
 
@@ -303,6 +377,10 @@ class BoardScene(QGraphicsScene):
 
     def highlight_reachable_tiles(self):
         """Marque les cases qui sont atteignable par la reine"""
+        if self.board_item is not None:
+            self.indicated_moves = list(self.possible_moves)
+            self.board_item.update()
+            return
         for tile_pos in self.possible_moves:
             brush = QBrush(self.POSSIBLE_MOVE_INDICATOR_COLOR)
             ellipse = self.addEllipse(self.get_reachable_tile_indicator_size(tile_pos), brush=brush)
@@ -310,7 +388,7 @@ class BoardScene(QGraphicsScene):
 
     def get_reachable_tile_indicator_size(self, pos):
         """Renvoie le rectangle des indicateurs de destination possible à la case pos"""
-        tile_rect = self.tiles_graphics_items[pos].sceneBoundingRect()
+        tile_rect = self.get_tile_rect(*pos)
         center = tile_rect.center()
         tile_rect.setSize(tile_rect.size() * REACHABLE_INDICATOR_SIZE_TO_TILE_SIZE_RATIO)
         tile_rect.moveCenter(center)
@@ -374,18 +452,26 @@ class BoardScene(QGraphicsScene):
         else:
             self.undo_action()
 
+    def _move_piece_item(self, from_pos, to_pos):
+        """
+        Déplace la reine de from_pos à to_pos dans les données de la scène, sans toucher aux autres éléments, et
+        renvoie son QGraphicsItem (à animer jusqu'à to_pos)
+        """
+        piece_item = self.pieces_graphics_items.pop(from_pos)
+        self.pieces_graphics_items[to_pos] = piece_item
+        self.pieces[to_pos] = self.pieces.pop(from_pos)
+        self.moving_queen = piece_item
+        return piece_item
+
     def perform_action(self, from_pos, to_pos, arr_pos):
         """Effectue une action déjà déterminée (par exemple si le joueur est une IA)"""
         self.ongoing_action = [from_pos, to_pos, arr_pos]
         try:
-            piece_item = self.pieces_graphics_items.pop(from_pos)
+            piece_item = self._move_piece_item(from_pos, to_pos)
         except KeyError:
             return
-        self.pieces_graphics_items[to_pos] = piece_item
 
         to_point = self.get_tile_rect(*to_pos).topLeft()
-        self.moving_queen = piece_item
-        self.pieces[to_pos] = self.pieces.pop(from_pos)
         AmazonsSound.shared.play_piece_move_sfx()
         PieceMoveAnimation(piece_item, to_point, finished=self.animate_action_arrow)
 
@@ -410,18 +496,12 @@ class BoardScene(QGraphicsScene):
         self.deselect_piece()
 
         # changer de place
-        piece_item = self.pieces_graphics_items[from_pos]
-        del self.pieces_graphics_items[from_pos]
-        self.pieces_graphics_items[to_pos] = piece_item
-
+        piece_item = self._move_piece_item(from_pos, to_pos)
         to_point = self.get_tile_rect(*to_pos).topLeft()
-        self.moving_queen = piece_item
 
         if not undoing and len(self.ongoing_action) == 1:
             self.ongoing_action.append(to_pos)
 
-        self.pieces[to_pos] = self.pieces.pop(from_pos)
-
         AmazonsSound.shared.play_piece_move_sfx()
 
         PieceMoveAnimation(piece_item, to_point, finished=None if undoing else self.handle_end_queen_move_animation)
@@ -446,8 +526,7 @@ class BoardScene(QGraphicsScene):
 
     def show_arrow(self, rotate_on_mouse_position_change=True):
         """Affiche l'image de la flèche à la position de la reine qui effectue l'action"""
-        arrow_icon = QPixmap(ARROW_ICON)
-        arrow_icon = self.scale_pixmap_tile_size(arrow_icon)
+        arrow_icon = self.scaled_pixmap(ARROW)
 
         queen_rect = self.moving_queen.sceneBoundingRect()
 
@@ -502,19 +581,26 @@ class BoardScene(QGraphicsScene):
 
         if self.prev_tile_under_mouse_pos is not None:
             # remettre le marqueur qui était dans un état sélectionné à son état normal
-            tile = self.possible_move_indicators_items[self.prev_tile_under_mouse_pos]
-            tile.setBrush(self.POSSIBLE_MOVE_INDICATOR_COLOR)
+            self.set_indicator_highlighted(self.prev_tile_under_mouse_pos, False)
 
         self.prev_tile_under_mouse_pos = tile_pos
 
         if tile_pos is not None:
             # the mouse is on top of a valid move tile, so highlight the indicator
-            tile = self.possible_move_indicators_items[tile_pos]
-            tile.setBrush(QBrush(self.POSSIBLE_MOVE_INDICATOR_COLOR_HIGHLIGHTED))
+            self.set_indicator_highlighted(tile_pos, True)
             self.scene_delegate.change_cursor(Qt.CrossCursor)
         else:
             self.scene_delegate.change_cursor(Qt.ArrowCursor)
 
+    def set_indicator_highlighted(self, pos, highlighted):
+        """Change la couleur du marqueur de destination possible de la case pos"""
+        if self.board_item is not None:
+            # BoardItem surligne le marqueur de prev_tile_under_mouse_pos
+            self.board_item.update(self.get_tile_rect(*pos))
+            return
+        color = self.POSSIBLE_MOVE_INDICATOR_COLOR_HIGHLIGHTED if highlighted else self.POSSIBLE_MOVE_INDICATOR_COLOR
+        self.possible_move_indicators_items[pos].setBrush(QBrush(color))
+
     def set_arrow_rotation_to_mouse_position(self, event):
         """
         Ajuste la rotation de la flèche à la position de la souris.
@@ -563,6 +649,48 @@ class BoardScene(QGraphicsScene):
 
 
 
+class BoardItem(QGraphicsItem):
+    """
+    Dessine en un seul élément toutes les flèches et tous les marqueurs de destination possible d'un BoardScene,
+    directement depuis ses données (arrows, indicated_moves), pour les grands plateaux
+    """
+    ARROW_PEN = QPen(QColor(0, 0, 0, 255))
+    ARROW_BRUSH = QBrush(QColor(0, 0, 0, 255))
+
+    def __init__(self, board_scene):
+        super().__init__()
+        self.board_scene = board_scene
+        self.setZValue(-1)  # sous les reines
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)  # pour option.exposedRect
+
+    def geometry_will_change(self):
+        """Doit être appelé avant que la taille ou la position du plateau ne change"""
+        self.prepareGeometryChange()
+
+    def boundingRect(self):
+        return self.board_scene.board_rect()
+
+    def paint(self, painter, option, widget=None):
+        scene = self.board_scene
+        exposed = option.exposedRect
+
+        painter.setPen(self.ARROW_PEN)
+        painter.setBrush(self.ARROW_BRUSH)
+        for pos in scene.arrows:
+            rect = scene.get_arrow_rect(*pos)
+            if rect.intersects(exposed):
+                painter.drawEllipse(rect)
+
+        painter.setPen(QPen(Qt.black))
+        for pos in scene.indicated_moves:
+            rect = scene.get_reachable_tile_indicator_size(pos)
+            if rect.intersects(exposed):
+                highlighted = pos == scene.prev_tile_under_mouse_pos
+                painter.setBrush(QBrush(scene.POSSIBLE_MOVE_INDICATOR_COLOR_HIGHLIGHTED if highlighted
+                                        else scene.POSSIBLE_MOVE_INDICATOR_COLOR))
+                painter.drawEllipse(rect)
+
+
 class PieceMoveAnimation(QGraphicsObject):
     """Effectue une animation d'un QGraphicsItem"""
     def __init__(self, item, to_pos, finished=None, duration=500, easing_curve=QEasingCurve.InOutSine):
@@ -5,10 +5,10 @@ Matricule:  521935
 """
 
 from PyQt5 import QtWidgets
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QResizeEvent
 from src.views.board_scene import BoardScene, BoardSceneViewDelegate
-from src.const import MIN_TILE_SIZE
+from src.const import MIN_TILE_SIZE, RESIZE_DEBOUNCE_MILLIS
 
 class BoardView(QtWidgets.QGraphicsView, BoardSceneViewDelegate):
     """Le widget Plateau"""
@@ -31,6 +31,15 @@ class BoardView(QtWidgets.QGraphicsView, BoardSceneViewDelegate):
 
         self.setMouseTracking(True)
 
+        # les cases (arrière-plan de la scène) ne sont redessinées que lorsque la taille ou une couleur change
+        self.setCacheMode(QtWidgets.QGraphicsView.CacheBackground)
+
+        # les images ne sont redimensionnées avec antialiasing qu'une fois le redimensionnement terminé
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DEBOUNCE_MILLIS)
+        self.resize_timer.timeout.connect(self.resize_settled)
+
         # rendre l'arrière-plan transparent
         self.setStyleSheet("background-color: transparent")
 
@@ -41,6 +50,11 @@ class BoardView(QtWidgets.QGraphicsView, BoardSceneViewDelegate):
     def resizeEvent(self, event: QResizeEvent) -> None:
         """Effectue un changement de taille du plateau lorsque celui-ci doit rétrécir ou agrandir"""
         super().resizeEvent(event)
+        self.board_scene.resize(self.rect(), smooth=False)
+        self.resize_timer.start()  # redémarre le délai à chaque évènement
+
+    def resize_settled(self):
+        """Redimensionne les images avec antialiasing une fois que la taille du plateau ne change plus"""
         self.board_scene.resize(self.rect())
 
     def scrollContentsBy(self, dx: int, dy: int) -> None:
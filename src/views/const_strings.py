@@ -42,6 +42,7 @@ START_GAME = "Commencer à jouer"
 RESTART_GAME = "Réinitialiser la partie"
 
 PLAYER_WON_MESS = "Le joueur {} a gagné"
+ENGINE_FAILED_MESS = "Le moteur de l'IA s'est arrêté, la partie est interrompue"
 
 CURRENT_TURN = "Au tour de: "
 
@@ -157,6 +157,16 @@ class GameWidget(QWidget, AmazonsSoundDelegate):
         mess_box.setStandardButtons(QMessageBox.Ok)
         mess_box.exec_()
 
+    def exhibit_error(self, message, details=None):
+        """Affiche un message d'erreur, et ses détails (str) s'ils sont donnés"""
+        mess_box = QMessageBox(self)
+        mess_box.setIcon(QMessageBox.Critical)
+        mess_box.setText(message)
+        if details:
+            mess_box.setDetailedText(details)
+        mess_box.setStandardButtons(QMessageBox.Ok)
+        mess_box.exec_()
+
     def restart_game(self):
         """Handler pour recommencer le jeu"""
         for delegate in self.delegates:
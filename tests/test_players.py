@@ -0,0 +1,63 @@
+"""
+Prénom:     Anton
+Nom:        ROMANOVA
+Matricule:  521935
+"""
+
+import unittest
+from src.const import PLAYER_1, PLAYER_2, SEARCH_MTDF, SEARCH_PVS
+from src.models.amazons import read_file
+from src.models.board import Board
+from src.models.players import AIPlayer, MCTSPlayer
+
+BOARD_PATH = 'ressources/boards/plateau_1.txt'
+
+
+class NewForBoardTest(unittest.TestCase):
+    """Player.new_for_board doit garder tous les paramètres du constructeur"""
+
+    def setUp(self):
+        self.board = Board(*read_file(BOARD_PATH))
+        self.new_board = Board(*read_file(BOARD_PATH))
+
+    def test_ai_player(self):
+        player = AIPlayer(self.board, PLAYER_2, fact=3, timeout=0.7, search=SEARCH_PVS, aspiration_window=42,
+                          lmr_min_moves=5, lmr_reduction=2, forward_pruning=7)
+        new_player = player.new_for_board(self.new_board)
+
+        self.assertIs(type(new_player), AIPlayer)
+        self.assertIs(new_player.board, self.new_board)
+        for attribute in ('player_id', 'fact', 'timeout', 'search', 'aspiration_window', 'lmr_min_moves',
+                          'lmr_reduction', 'forward_pruning'):
+            self.assertEqual(getattr(new_player, attribute), getattr(player, attribute), attribute)
+        # initialisés par le constructeur, avant toute recherche
+        self.assertEqual(new_player.killers, {})
+        self.assertEqual(new_player.history_heuristic, {})
+
+    def test_mcts_player(self):
+        player = MCTSPlayer(self.board, PLAYER_2, timeout=0.7, exploration=0.5, playouts=3, max_plies=9)
+        new_player = player.new_for_board(self.new_board)
+
+        self.assertIs(type(new_player), MCTSPlayer)
+        self.assertIs(new_player.board, self.new_board)
+        for attribute in ('player_id', 'timeout', 'exploration', 'playouts', 'max_plies'):
+            self.assertEqual(getattr(new_player, attribute), getattr(player, attribute), attribute)
+
+
+class CancelTest(unittest.TestCase):
+    """Une recherche annulée avant d'avoir trouvé une action renvoie None au lieu d'échouer"""
+
+    def test_cancel_before_search(self):
+        for search in (SEARCH_MTDF, SEARCH_PVS):
+            with self.subTest(search=search):
+                player = AIPlayer(Board(*read_file(BOARD_PATH)), PLAYER_1, timeout=0.7, search=search)
+                player.cancel()
+                action = player._play()
+                if search == SEARCH_MTDF:  # MTDF n'appelle pas minimax une fois le chronomètre expiré
+                    self.assertIsNone(action)
+                elif action is not None:  # PVS évalue au moins un enfant à la profondeur 1
+                    self.assertEqual(action.player_id, PLAYER_1)
+
+
+if __name__ == '__main__':
+    unittest.main()
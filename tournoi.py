@@ -17,32 +17,10 @@ from board import EndOfGameStatus
 from const import *
 from exceptions import *
 
-try:
-    from tournoi_numba_aot import fast_board
-except ImportError:
-    print("Impossible d'importer les binaires précompilés par numba...")
-    from pathlib import Path
-    if Path('tournoi_numba_aot').is_dir():
-        import shutil
-        try:
-            shutil.rmtree('tournoi_numba_aot/__pycache__')  # pour éviter des erreurs d'import
-        except OSError:
-            pass
-        print("Probablement la version de python utilisée est différente")
-        print("Essayons de compiler... ceci va prendre ~5s et se fera qu'une seule fois")
-        try:
-            from tournoi_numba_aot import fast_board_aot_compiler
-            fast_board_aot_compiler.compile()
-        except Exception as e:
-            print("Une erreur s'est produite lors de la compilation... :( ")
-            print(e)
-            exit()
-        else:
-            from tournoi_numba_aot import fast_board
-            print("Compilation réussie, continuons!")
-    else:
-        print("Le dossier numba n'a pas été importé")
-        exit()
+from tournoi_numba_aot.engine import load_engine
+
+# binaires pré-compilés s'ils sont à jour, sinon compilation à la volée (c.f. engine.load_engine)
+fast_board = load_engine()
 
 
 class GameTree:
@@ -145,6 +123,7 @@ class TournoiAIPlayer(AIPlayer):
         self.fact = fact
         self.timer = Timer()
         self.fast_board = FastBoard(board, self.player_id)
+        self.synced_plies = len(board.history)
 
         self.last_score = 0  # need that for MTDF
 
@@ -160,31 +139,19 @@ class TournoiAIPlayer(AIPlayer):
         # ~100x plus rapide de mettre le plateau à jour avec les mouvements de history que de le recopier (~10e-5 s)
         self.update_board()
 
+        # l'action sera effectuée sur fast_board par le prochain update_board, une fois jouée sur board
         action, action_np = self.iterative_deepening()
-
-        self.fast_board.act(*action_np, self.player_id)
         return action
 
     def update_board(self):
-        """Met le fast_board à jour avec les actions dans l'historique de self.board"""
-        i = -1
-        while True:  # dans le cas où l'autre joueur a effectué plusieurs action, on fait un loop
-            try:
-                last_action = self.board.history[i]
-            except IndexError:
-                return
-            else:
-                if last_action.player_id != self.player_id:
-                    self.fast_board.act_action(last_action)
-                else:
-                    # TODO: Remove that
-                    corr = {str(a) for a in self.board.possible_actions(self.player_id)}
-                    numb = {str(self.fast_board.seq_action_to_action(a, self.player_id)) for a in
-                            self.fast_board.possible_actions(self.player_id)}
-
-                    assert corr == numb
-                    return
-            i -= 1
+        """
+        Met le fast_board à jour avec les actions ajoutées à l'historique de self.board depuis le dernier appel
+        (le plateau du tournoi n'annule jamais d'action)
+        """
+        history = self.board.history
+        for action in history[self.synced_plies:]:
+            self.fast_board.act_action(action)
+        self.synced_plies = len(history)
 
     def iterative_deepening(self, max_depth=10):
         """
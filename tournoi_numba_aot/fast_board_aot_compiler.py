@@ -4,12 +4,18 @@ Nom:        ROMANOVA
 Matricule:  521935
 """
 
+import hashlib
 import numpy as np
 from numba.pycc import CC
 from numba import njit
 
 cc = CC("fast_board")
 
+# empreinte de ce fichier, compilée dans les binaires pour que engine.load_engine détecte des binaires périmés
+# (même calcul que engine.source_hash, ce module doit pouvoir être exécuté seul)
+with open(__file__, 'rb') as _source:
+    SOURCE_HASH = int(hashlib.sha1(_source.read().replace(b'\r\n', b'\n')).hexdigest()[:15], 16)
+
 @njit
 @cc.export('possible_moves', 'int8[:, :](int8[:, :], int8, int16, boolean[:, :], int8[:], int8[:, :, :, :], boolean)')
 def possible_moves(DIR, N, num_tiles, empty_cells, from_pos, cache, return_first_found):
@@ -116,6 +122,17 @@ def possible_actions_numba(DIR, N, num_tiles, empty_cells, queens, cache, return
     return actions[:actions_idx]
 
 
+@cc.export('engine_version', 'int64()')
+def engine_version():
+    """Renvoie l'empreinte des sources à partir desquelles les binaires ont été compilés"""
+    return SOURCE_HASH
+
+
+def exported_functions():
+    """dict: renvoie {nom d'export: (fonction python, signature)} de toutes les fonctions exportées"""
+    return {name: (entry.function, entry.signature) for name, entry in cc._exported_functions.items()}
+
+
 def compile():
     cc.compile()
 